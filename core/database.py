@@ -10,6 +10,16 @@ from datetime import datetime
 from typing import List, Dict, Optional, Any
 from config.settings import Settings
 
+def _convert_timestamp(value: bytes):
+    """Read TIMESTAMP columns as datetime once, keeping unparseable values as text"""
+    text = value.decode()
+    try:
+        return datetime.fromisoformat(text)
+    except ValueError:
+        return text
+
+sqlite3.register_converter("TIMESTAMP", _convert_timestamp)
+
 class DatabaseManager:
     """Manages SQLite database operations for ICAD files"""
     
@@ -17,6 +27,10 @@ class DatabaseManager:
         """Initialize database manager"""
         self.db_path = db_path or Settings.DB_PATH
         self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        
+        # Bumped on every write so callers can tell when cached rows are stale
+        self.generation = 0
+        
         self.init_database()
     
     def init_database(self):
@@ -58,6 +72,12 @@ class DatabaseManager:
             cursor.execute('''
                 CREATE INDEX IF NOT EXISTS idx_file_type ON files(file_type)
             ''')
+            cursor.execute('''
+                CREATE INDEX IF NOT EXISTS idx_file_size ON files(file_size)
+            ''')
+            cursor.execute('''
+                CREATE INDEX IF NOT EXISTS idx_modified_time ON files(modified_time)
+            ''')
             
             # Create scan_history table
             cursor.execute('''
@@ -71,6 +91,10 @@ class DatabaseManager:
                 )
             ''')
             
+            # Refresh planner statistics so a query combining the file type,
+            # size and date filters starts from the most selective index
+            cursor.execute('PRAGMA optimize')
+            
             conn.commit()
     
     def add_file(self, file_info: Dict[str, Any]) -> bool:
@@ -98,6 +122,7 @@ class DatabaseManager:
                 ))
                 
                 conn.commit()
+                self.generation += 1
                 return True
         except Exception as e:
             print(f"Error adding file to database: {e}")
@@ -110,6 +135,7 @@ class DatabaseManager:
                 cursor = conn.cursor()
                 cursor.execute('DELETE FROM files WHERE file_path = ?', (file_path,))
                 conn.commit()
+                self.generation += 1
                 return cursor.rowcount > 0
         except Exception as e:
             print(f"Error removing file from database: {e}")
@@ -118,7 +144,7 @@ class DatabaseManager:
     def get_file(self, file_path: str) -> Optional[Dict[str, Any]]:
         """Get a file from the database"""
         try:
-            with sqlite3.connect(self.db_path) as conn:
+            with sqlite3.connect(self.db_path, detect_types=sqlite3.PARSE_DECLTYPES) as conn:
                 conn.row_factory = sqlite3.Row
                 cursor = conn.cursor()
                 
@@ -136,10 +162,15 @@ class DatabaseManager:
             print(f"Error getting file from database: {e}")
             return None
     
-    def search_files(self, query: str = '', filter_type: str = 'All', limit: int = None) -> List[Dict[str, Any]]:
-        """Search files in the database"""
+    def search_files(self, query: str = '', filter_type: str = 'All', limit: int = None,
+                     filters: Optional[Dict[str, Any]] = None) -> List[Dict[str, Any]]:
+        """Search files in the database
+        
+        filters may hold file_types, date_from/date_to (datetime) and
+        size_min/size_max (bytes); they are applied in the WHERE clause.
+        """
         try:
-            with sqlite3.connect(self.db_path) as conn:
+            with sqlite3.connect(self.db_path, detect_types=sqlite3.PARSE_DECLTYPES) as conn:
                 conn.row_factory = sqlite3.Row
                 cursor = conn.cursor()
                 
@@ -169,6 +200,9 @@ class DatabaseManager:
                         ''')
                         params.extend([f'%{query}%'] * 4)
                 
+                if filters:
+                    self._add_filter_conditions(filters, where_conditions, params)
+                
                 # Build SQL query
                 sql = 'SELECT * FROM files'
                 if where_conditions:
@@ -198,6 +232,45 @@ class DatabaseManager:
             print(f"Error searching files: {e}")
             return []
     
+    def _add_filter_conditions(self, filters: Dict[str, Any], where_conditions: List[str], params: List[Any]):
+        """Append WHERE conditions and parameters for the file type, date and size filters"""
+        if filters.get('file_types'):
+            file_types = [ft.lower() for ft in filters['file_types']]
+            where_conditions.append(f"file_type IN ({', '.join('?' * len(file_types))})")
+            params.extend(file_types)
+        if filters.get('date_from'):
+            where_conditions.append('modified_time >= ?')
+            params.append(filters['date_from'].isoformat(' '))
+        if filters.get('date_to'):
+            where_conditions.append('modified_time <= ?')
+            params.append(filters['date_to'].isoformat(' '))
+        if filters.get('size_min'):
+            where_conditions.append('file_size >= ?')
+            params.append(filters['size_min'])
+        if filters.get('size_max'):
+            where_conditions.append('file_size <= ?')
+            params.append(filters['size_max'])
+    
+    def search_file_ids(self, filters: Dict[str, Any]) -> set:
+        """Get the ids of all files passing the filters, without loading rows"""
+        try:
+            with sqlite3.connect(self.db_path) as conn:
+                cursor = conn.cursor()
+                
+                where_conditions = []
+                params = []
+                self._add_filter_conditions(filters, where_conditions, params)
+                
+                sql = 'SELECT id FROM files'
+                if where_conditions:
+                    sql += ' WHERE ' + ' AND '.join(where_conditions)
+                
+                cursor.execute(sql, params)
+                return {row[0] for row in cursor.fetchall()}
+        except Exception as e:
+            print(f"Error filtering files: {e}")
+            return set()
+    
     def get_all_files(self, limit: int = None) -> List[Dict[str, Any]]:
         """Get all files from the database"""
         return self.search_files('', 'All', limit)
@@ -224,6 +297,7 @@ class DatabaseManager:
                 cursor = conn.cursor()
                 cursor.execute('DELETE FROM files')
                 conn.commit()
+                self.generation += 1
                 return True
         except Exception as e:
             print(f"Error clearing database: {e}")
@@ -314,6 +388,8 @@ class DatabaseManager:
                         removed_count += 1
                 
                 conn.commit()
+                if removed_count:
+                    self.generation += 1
                 return removed_count
         except Exception as e:
             print(f"Error cleaning up missing files: {e}")
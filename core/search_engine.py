@@ -4,11 +4,29 @@ Provides advanced search functionality for ICAD files.
 """
 
 import re
+from bisect import bisect_left
+from functools import lru_cache
 from typing import List, Dict, Any, Optional
 from datetime import datetime, timedelta
 from config.settings import Settings
 from core.database import DatabaseManager
 
+@lru_cache(maxsize=4096)
+def _parse_timestamp(raw: str) -> Optional[datetime]:
+    """Parse a stored timestamp once per distinct value"""
+    try:
+        return datetime.fromisoformat(raw)
+    except ValueError:
+        return None
+
+# Record fields covered by the substring index, keyed by quick_search type
+_INDEXED_FIELDS = {
+    'Filename': 'filename',
+    'Project': 'project_name',
+    'Job': 'job_name',
+    'Company': 'company_name',
+}
+
 class SearchEngine:
     """Advanced search engine for ICAD files"""
     
@@ -16,6 +34,35 @@ class SearchEngine:
         """Initialize search engine"""
         self.db_manager = db_manager
         
+        # Rows from the last full load, reused until the database changes
+        self._all_files = None
+        self._all_files_generation = None
+        
+        # Sorted token suffixes per field, rebuilt alongside _all_files
+        self._index = None
+        self._index_generation = None
+        
+        # What an empty search shows, rebuilt alongside _all_files
+        self._default_results = None
+        self._default_generation = None
+    
+    def get_all_files(self) -> List[Dict[str, Any]]:
+        """Get all files, reloading from the database only after it changed"""
+        generation = self.db_manager.generation
+        if self._all_files is None or self._all_files_generation != generation:
+            files = self.db_manager.get_all_files()
+            
+            # Searchable text is built once here instead of on every search
+            for file_info in files:
+                text = ' '.join(str(file_info[field]) for field in _INDEXED_FIELDS.values()
+                                if file_info.get(field))
+                file_info['_blob'] = text
+                file_info['_blob_lower'] = text.lower()
+            
+            self._all_files = files
+            self._all_files_generation = generation
+        return self._all_files
+        
     def search(self, query: str, filters: Optional[Dict[str, Any]] = None) -> List[Dict[str, Any]]:
         """
         Perform advanced search with filters
@@ -41,6 +88,14 @@ class SearchEngine:
         
         return results[:Settings.MAX_SEARCH_RESULTS]
     
+    def default_result_set(self) -> List[Dict[str, Any]]:
+        """Get the files shown when there are no search criteria"""
+        files = self.get_all_files()
+        if self._default_results is None or self._default_generation != self._all_files_generation:
+            self._default_results = files[:Settings.MAX_SEARCH_RESULTS]
+            self._default_generation = self._all_files_generation
+        return self._default_results
+    
     def quick_search(self, query: str, search_type: str = 'All') -> List[Dict[str, Any]]:
         """
         Perform quick search (used by search widget)
@@ -52,8 +107,91 @@ class SearchEngine:
         Returns:
             List of matching files
         """
+        # Any substring of a field that has no whitespace lies inside one of
+        # its tokens, so the suffix index answers it without scanning rows
+        if query.strip():
+            return self._index_search(query.lower(), search_type)[:Settings.MAX_SEARCH_RESULTS]
+        
         return self.db_manager.search_files(query, search_type, Settings.MAX_SEARCH_RESULTS)
     
+    def build_index(self):
+        """Build the token suffix index over the cached files if it is stale"""
+        files = self.get_all_files()
+        if self._index is not None and self._index_generation == self._all_files_generation:
+            return
+        
+        index = {}
+        for field in _INDEXED_FIELDS.values():
+            suffixes = {}
+            for i, file_info in enumerate(files):
+                value = file_info.get(field)
+                if not value:
+                    continue
+                for token in str(value).lower().split():
+                    for start in range(len(token)):
+                        suffixes.setdefault(token[start:], set()).add(i)
+            keys = sorted(suffixes)
+            index[field] = (keys, [suffixes[k] for k in keys])
+        
+        self._index = index
+        self._index_generation = self._all_files_generation
+    
+    def _lookup(self, field: str, token: str) -> set:
+        """Get ids of files with a token in field that contains token"""
+        keys, ids = self._index[field]
+        matches = set()
+        i = bisect_left(keys, token)
+        while i < len(keys) and keys[i].startswith(token):
+            matches |= ids[i]
+            i += 1
+        return matches
+    
+    def _index_search(self, query_lower: str, search_type: str) -> List[Dict[str, Any]]:
+        """Find files whose indexed fields contain query_lower, in filename order
+        
+        A query without whitespace is answered by the index alone. Otherwise
+        every query word must occur inside some token of the field, so the
+        intersection of their postings narrows the rows that get a substring test.
+        """
+        self.build_index()
+        files = self._all_files
+        
+        field = _INDEXED_FIELDS.get(search_type)
+        fields = [field] if field else _INDEXED_FIELDS.values()
+        words = query_lower.split()
+        
+        matches = set()
+        for field in fields:
+            if len(words) == 1 and words[0] == query_lower:
+                matches |= self._lookup(field, query_lower)
+                continue
+            
+            candidates = set.intersection(*(self._lookup(field, word) for word in words))
+            matches.update(i for i in candidates
+                           if query_lower in str(files[i].get(field) or '').lower())
+        
+        return [files[i] for i in sorted(matches)]
+    
+    def search_filtered(self, query: str, search_type: str, filters: Dict[str, Any],
+                        limit: Optional[int] = Settings.MAX_SEARCH_RESULTS) -> List[Dict[str, Any]]:
+        """
+        Perform quick search with file type, date and size filters applied in SQL
+        
+        Args:
+            query: Search query string
+            search_type: Type of search ('All', 'Filename', 'Project', 'Job', 'Company')
+            filters: Dictionary of filters to apply
+            limit: Maximum number of results, or None for all
+        
+        Returns:
+            List of matching files
+        """
+        return self.db_manager.search_files(query, search_type, limit, filters)
+    
+    def filter_file_ids(self, filters: Dict[str, Any]) -> set:
+        """Get the ids of all files passing the file type, date and size filters"""
+        return self.db_manager.search_file_ids(filters)
+    
     def _parse_query(self, query: str) -> Dict[str, List[str]]:
         """Parse search query into terms and operators"""
         terms = {
@@ -88,8 +226,8 @@ class SearchEngine:
     
     def _search_with_filters(self, search_terms: Dict[str, List[str]], filters: Dict[str, Any]) -> List[Dict[str, Any]]:
         """Search with advanced filters"""
-        # Start with all files
-        results = self.db_manager.get_all_files()
+        # Start with all files passing the SQL-side filters
+        results = self.db_manager.search_files(filters=filters)
         
         # Apply text search
         if any(search_terms.values()):
@@ -164,75 +302,15 @@ class SearchEngine:
         return True
     
     def _apply_filters(self, files: List[Dict[str, Any]], filters: Dict[str, Any]) -> List[Dict[str, Any]]:
-        """Apply various filters to files"""
-        filtered_files = files
-        
-        # File type filter
-        if filters.get('file_types'):
-            file_types = [ft.lower() for ft in filters['file_types']]
-            filtered_files = [f for f in filtered_files if f.get('file_type', '').lower() in file_types]
-        
-        # Date range filter
-        if filters.get('date_from') or filters.get('date_to'):
-            filtered_files = self._filter_by_date(filtered_files, filters.get('date_from'), filters.get('date_to'))
-        
-        # Size range filter
-        if filters.get('size_min') or filters.get('size_max'):
-            filtered_files = self._filter_by_size(filtered_files, filters.get('size_min'), filters.get('size_max'))
-        
-        # Project filter
-        if filters.get('projects'):
-            projects = [p.lower() for p in filters['projects']]
-            filtered_files = [f for f in filtered_files if f.get('project_name', '').lower() in projects]
-        
-        # Company filter
-        if filters.get('companies'):
-            companies = [c.lower() for c in filters['companies']]
-            filtered_files = [f for f in filtered_files if f.get('company_name', '').lower() in companies]
-        
-        return filtered_files
-    
-    def _filter_by_date(self, files: List[Dict[str, Any]], date_from: Optional[datetime], date_to: Optional[datetime]) -> List[Dict[str, Any]]:
-        """Filter files by date range"""
-        filtered_files = []
-        
-        for file_info in files:
-            file_date = file_info.get('modified_time')
-            if isinstance(file_date, str):
-                try:
-                    file_date = datetime.fromisoformat(file_date)
-                except:
-                    continue
-            
-            if not isinstance(file_date, datetime):
-                continue
-            
-            # Check date range
-            if date_from and file_date < date_from:
-                continue
-            if date_to and file_date > date_to:
-                continue
-            
-            filtered_files.append(file_info)
-        
-        return filtered_files
-    
-    def _filter_by_size(self, files: List[Dict[str, Any]], size_min: Optional[int], size_max: Optional[int]) -> List[Dict[str, Any]]:
-        """Filter files by size range"""
-        filtered_files = []
-        
-        for file_info in files:
-            file_size = file_info.get('file_size', 0)
-            
-            # Check size range
-            if size_min and file_size < size_min:
-                continue
-            if size_max and file_size > size_max:
-                continue
-            
-            filtered_files.append(file_info)
+        """Apply the filters the database query doesn't cover, in a single pass"""
+        projects = {p.lower() for p in filters.get('projects') or ()}
+        companies = {c.lower() for c in filters.get('companies') or ()}
+        if not projects and not companies:
+            return files
         
-        return filtered_files
+        return [f for f in files
+                if (not projects or f.get('project_name', '').lower() in projects)
+                and (not companies or f.get('company_name', '').lower() in companies)]
     
     def _sort_by_relevance(self, files: List[Dict[str, Any]], query: str) -> List[Dict[str, Any]]:
         """Sort files by relevance to query"""
@@ -240,6 +318,7 @@ class SearchEngine:
             return files
         
         query_lower = query.lower()
+        now = datetime.now()
         
         def relevance_score(file_info):
             score = 0
@@ -279,13 +358,10 @@ class SearchEngine:
             # Recent files get slight boost
             modified_time = file_info.get('modified_time')
             if isinstance(modified_time, str):
-                try:
-                    modified_time = datetime.fromisoformat(modified_time)
-                except:
-                    modified_time = None
+                modified_time = _parse_timestamp(modified_time)
             
             if isinstance(modified_time, datetime):
-                days_old = (datetime.now() - modified_time).days
+                days_old = (now - modified_time).days
                 if days_old < 7:
                     score += 5
                 elif days_old < 30:
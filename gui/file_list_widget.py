@@ -17,10 +17,12 @@ from utils.file_utils import FileUtils
 class FileListWidget:
     """File list widget with search results and keyboard navigation"""
     
-    def __init__(self, parent: tk.Widget, db_manager: DatabaseManager, callback: Callable):
+    def __init__(self, parent: tk.Widget, db_manager: DatabaseManager, callback: Callable,
+                 prefetch_callback: Optional[Callable] = None):
         self.parent = parent
         self.db_manager = db_manager
         self.callback = callback
+        self.prefetch_callback = prefetch_callback
         
         # Data
         self.files = []
@@ -29,6 +31,10 @@ class FileListWidget:
         self.sort_column = 'filename'
         self.sort_reverse = False
         
+        # Rows are inserted in chunks; a newer display cancels pending chunks
+        self._render_epoch = 0
+        self._render_chunk = 500
+        
         # Setup UI
         self.setup_ui()
         self.setup_bindings()
@@ -197,15 +203,16 @@ class FileListWidget:
     def update_display(self):
         """Update the treeview display"""
         # Clear existing items
-        for item in self.tree.get_children():
-            self.tree.delete(item)
+        children = self.tree.get_children()
+        if children:
+            self.tree.delete(*children)
         
         # Sort files
         self.sort_files()
         
-        # Add files to tree
-        for i, file_info in enumerate(self.filtered_files):
-            self.add_file_to_tree(file_info, i)
+        # Add files to tree, first chunk now and the rest between redraws
+        self._render_epoch += 1
+        self._insert_rows(self._render_epoch, 0)
         
         # Update counts
         self.update_counts()
@@ -216,6 +223,18 @@ class FileListWidget:
             self.tree.selection_set(first_item)
             self.tree.focus(first_item)
     
+    def _insert_rows(self, epoch: int, start: int):
+        """Insert one chunk of filtered files and schedule the next"""
+        if epoch != self._render_epoch:
+            return
+        
+        end = min(start + self._render_chunk, len(self.filtered_files))
+        for i in range(start, end):
+            self.add_file_to_tree(self.filtered_files[i], i)
+        
+        if end < len(self.filtered_files):
+            self.tree.after_idle(self._insert_rows, epoch, end)
+    
     def add_file_to_tree(self, file_info: Dict[str, Any], index: int):
         """Add a file to the treeview"""
         # Prepare values
@@ -337,6 +356,10 @@ class FileListWidget:
                 self.selected_file = file_info
                 self.callback(file_info)
                 
+                # Let the preview warm up the rows below the selection
+                if self.prefetch_callback:
+                    self.prefetch_callback(self.get_upcoming_files(item))
+                
                 # Update selection label
                 filename = file_info.get('filename', 'Unknown')
                 self.selection_label.config(text=f"Selected: {filename}")
@@ -363,6 +386,14 @@ class FileListWidget:
             pass
         return None
     
+    def get_upcoming_files(self, item, count: int = 8) -> List[Dict[str, Any]]:
+        """Get file info for the rows following a tree item"""
+        try:
+            index = self.tree.index(item)
+        except tk.TclError:
+            return []
+        return self.filtered_files[index + 1:index + 1 + count]
+    
     def on_double_click(self, event):
         """Handle double-click on file"""
         self.open_file()
@@ -18,7 +18,8 @@ def setup_main_layout(self):
     self.search_widget = SearchWidget(left_panel, self.search_engine, self.on_search_results)
     
     # File list widget  
-    self.file_list_widget = FileListWidget(left_panel, self.db_manager, self.on_file_selected)
+    self.file_list_widget = FileListWidget(left_panel, self.db_manager, self.on_file_selected,
+                                           lambda files: self.preview_widget.prefetch(files))
     
     # Right panel (preview)
     right_panel = ttk.Frame(self.paned_window)
@@ -5,36 +5,68 @@ Replaces complex 3D libraries with your working screen capture system.
 
 import tkinter as tk
 from tkinter import ttk, messagebox
-from typing import Dict, Any, Optional
+from typing import Dict, Any, List, Optional
 from pathlib import Path
+from contextlib import contextmanager
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor, Future
 import os
+import sys
+import subprocess
+import functools
 from datetime import datetime
-import threading
+
+try:
+    from PIL import Image, ImageTk
+    PIL_AVAILABLE = True
+except ImportError:
+    Image = ImageTk = None
+    PIL_AVAILABLE = False
+    print("Warning: Pillow not available, thumbnails disabled. Run: pip install pillow")
 
 # Import your working screen capture system
 from icad_screen_capture import ICADScreenCapture
 
-class ThumbnailWorker(threading.Thread):
-    """Background worker for generating thumbnails"""
-    
-    def __init__(self, file_path: str, screen_capture: ICADScreenCapture, callback):
-        super().__init__(daemon=True)
-        self.file_path = file_path
-        self.screen_capture = screen_capture
-        self.callback = callback
-        
-    def run(self):
-        try:
-            # Generate thumbnail using your working screen capture
-            thumbnail_path = self.screen_capture.generate_thumbnail(Path(self.file_path))
-            
-            if thumbnail_path:
-                self.callback(str(thumbnail_path), None)
-            else:
-                self.callback(None, "Could not generate thumbnail")
-                
-        except Exception as e:
-            self.callback(None, f"Error: {e}")
+# File type lookups
+_FILE_TYPE_ICONS = {
+    '.dwg': '🔧',
+    '.dxf': '📐',
+    '.icad': '⚙️',
+    '.icd': '📋',
+    '.ifc': '🏢',
+    '.step': '⚙️',
+    '.stp': '⚙️',
+    '.pdf': '📄',
+}
+
+_FILE_TYPE_DESCRIPTIONS = {
+    '.dwg': 'AutoCAD Drawing',
+    '.dxf': 'AutoCAD Exchange',
+    '.icad': 'ICAD File',
+    '.icd': 'ICAD Document',
+    '.ifc': 'Industry Foundation Classes',
+    '.step': 'STEP 3D Model',
+    '.stp': 'STEP 3D Model',
+    '.pdf': 'PDF Document',
+}
+
+# Static tail of the details tab
+_ACTIONS_BLOCK = (
+    "💡 Actions:\n"
+    "• Double-click to open file\n"
+    "• Right-click for more options\n"
+    "• Use 'Open' button to launch file\n"
+    "• Use 'Location' button to open folder\n"
+    "• Use '🔄 Refresh' to regenerate thumbnail\n"
+)
+
+@functools.lru_cache(maxsize=512)
+def _fmt_modified(raw: str) -> str:
+    """Format an ISO timestamp for display, memoized for repeat selections"""
+    try:
+        return datetime.fromisoformat(raw.replace('Z', '+00:00')).strftime('%Y-%m-%d %H:%M:%S')
+    except ValueError:
+        return raw
 
 class PreviewWidget:
     """Simplified preview widget with working ICAD screen capture"""
@@ -42,15 +74,73 @@ class PreviewWidget:
     def __init__(self, parent: tk.Widget):
         self.parent = parent
         self.current_file = None
+        self._file_type_lc = ''
         self.preview_image = None
+        
+        # Canvas-sized thumbnail frames keyed by (path, mtime, width, height),
+        # least recently used first. They are pasted into one resident
+        # PhotoImage instead of allocating a Tk image per selection.
+        self._frame_cache = OrderedDict()
+        self._frame_cache_size = 64
+        self._photo_size = None
         self.screen_capture = ICADScreenCapture()
-        self.thumbnail_worker = None
+        
+        # Background thumbnail generation; the newest request always wins.
+        # The ICAD process is the bottleneck, so only widen the pool when
+        # Python code can actually run in parallel (free-threaded builds).
+        gil_enabled = sys._is_gil_enabled() if hasattr(sys, "_is_gil_enabled") else True
+        max_workers = 2 if gil_enabled else min(4, os.cpu_count() or 2)
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="thumb")
+        self._current_token = 0
+        self._current_future = None
+        
+        # Low-priority decoding of cached thumbnails for rows the user is
+        # likely to select next. It never starts ICAD.
+        self._prefetch_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="thumb-prefetch")
+        self._inflight: Dict[tuple, Future] = {}
+        
+        # Tabs whose content is stale; only the visible one is rebuilt
+        self._dirty = {'Thumbnail': True, 'Details': True}
+        self._last_details_key = None
+        
+        # Stat results for the selected file, taken once per selection
+        self._src_stat = None
+        self._thumb_path = None
+        self._thumb_stat = None
+        
+        # Debounce timer for the expensive part of preview_file
+        self._pending_preview_id = None
+        
+        # What the thumbnail canvas is currently showing
+        self._preview_mode = None
+        self._preview_payload = None
+        self._canvas_item = None
+        self._resize_job = None
+        
+        # Last non-content state rendered, so repeated calls are no-ops
+        self._ui_state = 'init'
         
         # Setup UI
         self.setup_ui()
         
         # Show initial empty state
         self.show_empty_state()
+        
+        # Absorb one-time initialization cost before the first click
+        self.parent.after(100, self._warmup)
+    
+    def _warmup(self):
+        """Pay Pillow/Tk image and worker thread start-up costs while the user isn't waiting"""
+        try:
+            if PIL_AVAILABLE:
+                image = Image.new('RGB', (1, 1))
+                image.thumbnail((1, 1), Image.Resampling.LANCZOS)
+                ImageTk.PhotoImage(image)
+            
+            # Spins up a worker thread ahead of the first real thumbnail job
+            self._executor.submit(lambda: None)
+        except Exception as e:
+            print(f"Preview warmup failed: {e}")
     
     def setup_ui(self):
         """Setup preview widget UI"""
@@ -104,6 +194,9 @@ class PreviewWidget:
         
         # Details tab
         self.setup_details_tab()
+        
+        # Populate tabs lazily when they become visible
+        self.notebook.bind('<<NotebookTabChanged>>', self._on_tab_changed)
     
     def setup_thumbnail_tab(self):
         """Setup thumbnail preview tab"""
@@ -118,6 +211,7 @@ class PreviewWidget:
         self.thumbnail_canvas = tk.Canvas(self.thumbnail_container, bg='white', 
                                         width=400, height=300)
         self.thumbnail_canvas.pack(expand=True, fill=tk.BOTH)
+        self.thumbnail_canvas.bind('<Configure>', self._queue_canvas_update)
         
         # Loading frame
         self.loading_frame = ttk.Frame(self.thumbnail_container)
@@ -166,10 +260,15 @@ class PreviewWidget:
     def preview_file(self, file_info: Dict[str, Any]):
         """Preview a file with ICAD thumbnail"""
         self.current_file = file_info
+        self._file_type_lc = file_info.get('file_type', '').lower()
+        self._ui_state = 'content'
+        
+        # A thumbnail still being made for the previous selection must not land on this one
+        self._supersede_thumbnail_job()
         
         # Update header
         filename = file_info.get('filename', 'Unknown')
-        self.filename_label.config(text=filename)
+        self._set_text(self.filename_label, filename)
         
         # Enable action buttons
         self.open_btn.config(state=tk.NORMAL)
@@ -178,20 +277,113 @@ class PreviewWidget:
         
         # Update footer
         file_size = file_info.get('file_size', 0)
-        self.size_label.config(text=self.format_file_size(file_size))
+        self._set_text(self.size_label, self.format_file_size(file_size))
+        
+        # Update status
+        self._set_text(self.status_label, f"Previewing: {filename}")
+        
+        # Defer the heavy work until selection settles (e.g. arrow-key scrolling)
+        self._cancel_pending_preview()
+        self._pending_preview_id = self.parent.after(80, self._do_heavy_preview, file_info)
+    
+    def _cancel_pending_preview(self):
+        """Cancel a scheduled heavy preview, if any"""
+        if self._pending_preview_id is not None:
+            self.parent.after_cancel(self._pending_preview_id)
+            self._pending_preview_id = None
+    
+    def _do_heavy_preview(self, file_info: Dict[str, Any]):
+        """Stat the file and build the visible tab once selection has settled"""
+        self._pending_preview_id = None
+        if file_info is not self.current_file:
+            return
+        
+        self._stat_current_file()
+        
+        # Mark all tabs stale and only build the one being shown
+        for tab in self._dirty:
+            self._dirty[tab] = True
+        self._refresh_visible_tab()
+    
+    def _stat_current_file(self):
+        """Stat the selected file and its cached thumbnail once per selection"""
+        self._src_stat = None
+        self._thumb_path = None
+        self._thumb_stat = None
+        
+        file_path = self.current_file.get('file_path', '')
+        if not file_path:
+            return
+        
+        try:
+            self._src_stat = os.stat(file_path)
+        except OSError:
+            return
+        
+        if file_path.lower().endswith('.icd'):
+            self._thumb_path = self._lookup_thumb_path(file_path, self._src_stat)
+            self._stat_thumbnail()
+    
+    def _lookup_thumb_path(self, file_path: str, stat: Optional[os.stat_result] = None) -> Optional[Path]:
+        """Get the thumbnail cache path for a file if its cache key is already known
+        
+        Never hashes the file, so it is safe on the Tk thread. Unknown keys
+        give None and are resolved by the thumbnail worker instead.
+        """
+        return self.screen_capture.get_thumbnail_path(file_path, stat, hash_content=False)
+    
+    def _stat_thumbnail(self):
+        """Refresh the cached stat of the selected file's thumbnail"""
+        try:
+            self._thumb_stat = os.stat(self._thumb_path) if self._thumb_path else None
+        except OSError:
+            self._thumb_stat = None
+    
+    def _on_tab_changed(self, event=None):
+        """Build the newly selected tab if its content is stale"""
+        # Only animate the progress bar while it can actually be seen
+        if self._preview_mode == 'loading':
+            if self._thumbnail_tab_visible():
+                self.loading_progress.start()
+            else:
+                self.loading_progress.stop()
+        
+        self._refresh_visible_tab()
+    
+    def _set_text(self, widget: tk.Widget, value: str):
+        """Set a label's text, skipping the re-layout when it is unchanged"""
+        if getattr(widget, '_last_text', None) == value:
+            return
+        widget._last_text = value
+        widget.config(text=value)
+    
+    def _thumbnail_tab_visible(self) -> bool:
+        """Check whether the Thumbnail tab is the selected one"""
+        return self.notebook.tab(self.notebook.select(), 'text') == 'Thumbnail'
+    
+    def _refresh_visible_tab(self):
+        """Rebuild the visible tab for the current file if it is marked dirty"""
+        if not self.current_file or self._pending_preview_id is not None:
+            return
         
-        # Update details
-        self.update_details()
+        tab = self.notebook.tab(self.notebook.select(), 'text')
+        if not self._dirty.get(tab):
+            return
+        self._dirty[tab] = False
         
+        if tab == 'Details':
+            self.update_details()
+        else:
+            self.update_thumbnail()
+    
+    def update_thumbnail(self):
+        """Update thumbnail tab for the current file"""
         # Load thumbnail for .icd files
-        file_path = file_info.get('file_path', '')
+        file_path = self.current_file.get('file_path', '')
         if file_path and file_path.lower().endswith('.icd'):
             self.load_thumbnail()
         else:
             self.show_file_type_icon()
-        
-        # Update status
-        self.status_label.config(text=f"Previewing: {filename}")
     
     def load_thumbnail(self):
         """Load or generate thumbnail for ICAD file"""
@@ -199,17 +391,15 @@ class PreviewWidget:
             return
         
         file_path = self.current_file.get('file_path', '')
-        if not file_path or not Path(file_path).exists():
+        if not file_path or self._src_stat is None:
             self.show_error("File not found")
             return
         
         # Check if thumbnail already exists
-        thumbnail_path = self.screen_capture.get_thumbnail_path(file_path)
-        
-        if thumbnail_path and thumbnail_path.exists():
+        if self._thumb_stat is not None:
             # Load existing thumbnail
-            self.display_thumbnail(str(thumbnail_path))
-            self.thumbnail_status.config(text=f"Cached thumbnail: {Path(file_path).name}")
+            self.display_thumbnail(str(self._thumb_path), self._thumb_stat.st_mtime)
+            self._set_text(self.thumbnail_status, f"Cached thumbnail: {Path(file_path).name}")
         else:
             # Generate new thumbnail
             self.generate_thumbnail()
@@ -226,134 +416,271 @@ class PreviewWidget:
         # Show loading state
         self.show_loading()
         
-        # Cancel any existing thumbnail generation
-        if self.thumbnail_worker and self.thumbnail_worker.is_alive():
+        token = self._supersede_thumbnail_job()
+        
+        # Start thumbnail generation in background. Prefetch never generates,
+        # so this is always a job of our own and safe to cancel later.
+        future = self._executor.submit(self.screen_capture.generate_thumbnail, file_path)
+        future.add_done_callback(lambda f: self.parent.after(0, self._dispatch, token, f))
+        self._current_future = future
+    
+    def _supersede_thumbnail_job(self) -> int:
+        """Drop the outstanding thumbnail job, if any, and return a fresh token
+        
+        Jobs that have not started are cancelled; a running one still
+        finishes, but _dispatch ignores it since its token is no longer current.
+        """
+        if self._current_future is not None:
+            self._current_future.cancel()
+            self._current_future = None
+        
+        self._current_token += 1
+        return self._current_token
+    
+    def prefetch(self, file_infos: List[Dict[str, Any]], window: int = 8):
+        """Decode cached thumbnails for files the user is likely to select next
+        
+        Only thumbnails that are already cached are touched; generating one
+        means driving ICAD, which must only happen for an explicit selection.
+        """
+        if not PIL_AVAILABLE:
+            return
+        
+        cw = max(self.thumbnail_canvas.winfo_width(), 400)
+        ch = max(self.thumbnail_canvas.winfo_height(), 300)
+        
+        for file_info in file_infos[:window]:
+            file_path = file_info.get('file_path', '')
+            if not file_path or not file_path.lower().endswith('.icd'):
+                continue
+            
+            thumbnail_path = self._lookup_thumb_path(file_path)
+            if not thumbnail_path or not self.screen_capture.is_cached(thumbnail_path):
+                continue
+            
+            try:
+                mtime = os.path.getmtime(thumbnail_path)
+            except OSError:
+                continue
+            
+            key = (str(thumbnail_path), mtime, cw, ch)
+            if key in self._frame_cache or key in self._inflight:
+                continue
+            
+            future = self._prefetch_executor.submit(self._build_frame, str(thumbnail_path), cw, ch)
+            future.add_done_callback(
+                lambda f, k=key: self.parent.after(0, self._store_prefetched_frame, k, f))
+            self._inflight[key] = future
+    
+    def _store_prefetched_frame(self, key: tuple, future: Future):
+        """Add a frame decoded by prefetch to the frame cache"""
+        self._inflight.pop(key, None)
+        try:
+            self._store_frame(key, future.result())
+        except Exception:
+            pass
+    
+    def _dispatch(self, token: int, future: Future):
+        """Deliver a finished thumbnail job unless a newer one replaced it"""
+        if token != self._current_token or future.cancelled():
+            return
+        self._current_future = None
+        
+        try:
+            thumbnail_path = future.result()
+        except Exception as e:
+            self.on_thumbnail_generated(None, f"Error: {e}")
             return
         
-        # Start thumbnail generation in background
-        self.thumbnail_worker = ThumbnailWorker(
-            file_path,
-            self.screen_capture,
-            self.on_thumbnail_generated
-        )
-        self.thumbnail_worker.start()
+        if thumbnail_path:
+            self.on_thumbnail_generated(str(thumbnail_path), None)
+        else:
+            self.on_thumbnail_generated(None, "Could not generate thumbnail")
+    
+    def _set_preview_mode(self, mode: str, **payload):
+        """Switch the thumbnail canvas to a display mode, touching only what changed
+        
+        Modes: 'empty', 'loading', 'image' (image=PhotoImage),
+        'icon' (icon=, description=, filename=) and 'error' (message=).
+        """
+        if mode == self._preview_mode and payload == self._preview_payload:
+            return
+        
+        # Same mode with a new picture only needs the item retargeted
+        if mode == 'image' and self._preview_mode == 'image':
+            self.thumbnail_canvas.itemconfig(self._canvas_item, image=payload['image'])
+            self._preview_payload = payload
+            return
+        
+        # Leaving the loading overlay
+        if self._preview_mode == 'loading':
+            self.loading_progress.stop()
+            self.loading_frame.place_forget()
+        
+        canvas = self.thumbnail_canvas
+        canvas.delete("all")
+        self._canvas_item = None
+        
+        if mode == 'loading':
+            self.loading_frame.place(relx=0.5, rely=0.5, anchor=tk.CENTER)
+            if self._thumbnail_tab_visible():
+                self.loading_progress.start()
+        elif mode == 'image':
+            x, y = self._canvas_center()
+            self._canvas_item = canvas.create_image(x, y, image=payload['image'])
+        elif mode == 'icon':
+            canvas.create_text(200, 130, text=payload['icon'], 
+                               font=('TkDefaultFont', 48), fill='gray')
+            canvas.create_text(200, 185, text=f"{payload['description']}\n{payload['filename']}", 
+                               font=('TkDefaultFont', 12), fill='gray', justify=tk.CENTER)
+        elif mode == 'error':
+            canvas.create_text(200, 150, text=f"❌ {payload['message']}", 
+                               font=('TkDefaultFont', 12), fill='red')
+        else:  # empty
+            canvas.create_text(200, 150, text="Select a file to preview", 
+                               font=('TkDefaultFont', 12), fill='gray')
+        
+        self._preview_mode = mode
+        self._preview_payload = payload
+    
+    def _canvas_center(self):
+        """Get the center point of the thumbnail canvas"""
+        canvas_width = self.thumbnail_canvas.winfo_width()
+        canvas_height = self.thumbnail_canvas.winfo_height()
+        
+        if canvas_width > 1 and canvas_height > 1:
+            return canvas_width // 2, canvas_height // 2
+        return 200, 150
+    
+    def _queue_canvas_update(self, event=None):
+        """Coalesce a burst of canvas resize events into one idle update"""
+        if self._resize_job is None:
+            self._resize_job = self.thumbnail_canvas.after_idle(self._do_canvas_update)
+    
+    def _do_canvas_update(self):
+        """Keep the displayed thumbnail centered after the canvas resized"""
+        self._resize_job = None
+        if self._canvas_item is not None:
+            self.thumbnail_canvas.coords(self._canvas_item, *self._canvas_center())
     
     def show_loading(self):
         """Show loading state"""
-        # Clear canvas
-        self.thumbnail_canvas.delete("all")
-        
-        # Show loading frame
-        self.loading_frame.place(relx=0.5, rely=0.5, anchor=tk.CENTER)
-        self.loading_progress.start()
+        self._ui_state = 'content'
+        self._set_preview_mode('loading')
         self.loading_label.config(text="Generating ICAD thumbnail...")
         
         filename = self.current_file.get('filename', 'file') if self.current_file else 'file'
-        self.thumbnail_status.config(text=f"Generating thumbnail for {filename}...")
+        self._set_text(self.thumbnail_status, f"Generating thumbnail for {filename}...")
     
     def on_thumbnail_generated(self, thumbnail_path: str, error: str):
         """Handle thumbnail generation completion"""
-        # Hide loading
-        self.loading_progress.stop()
-        self.loading_frame.place_forget()
+        # Cache status shown in the details tab has changed
+        self._dirty['Details'] = True
+        self._last_details_key = None
+        if thumbnail_path:
+            # The worker may have resolved a cache key the lookup didn't know
+            self._thumb_path = Path(thumbnail_path)
+        self._stat_thumbnail()
         
         if error:
             self.show_error(error)
         elif thumbnail_path:
             self.display_thumbnail(thumbnail_path)
-            self.thumbnail_status.config(text=f"Thumbnail generated: {Path(thumbnail_path).name}")
+            self._set_text(self.thumbnail_status, f"Thumbnail generated: {Path(thumbnail_path).name}")
         else:
             self.show_error("Could not generate thumbnail")
     
-    def display_thumbnail(self, thumbnail_path: str):
+    def display_thumbnail(self, thumbnail_path: str, mtime: Optional[float] = None):
         """Display thumbnail in canvas"""
+        if not PIL_AVAILABLE:
+            self.show_error("Pillow not installed - cannot display thumbnails")
+            return
+        
         try:
-            from PIL import Image, ImageTk
-            
-            # Load thumbnail
-            image = Image.open(thumbnail_path)
-            
-            # Convert to PhotoImage
-            self.preview_image = ImageTk.PhotoImage(image)
+            if mtime is None:
+                mtime = os.path.getmtime(thumbnail_path)
+            cw = max(self.thumbnail_canvas.winfo_width(), 400)
+            ch = max(self.thumbnail_canvas.winfo_height(), 300)
+            key = (thumbnail_path, mtime, cw, ch)
+            frame = self._frame_cache.get(key)
             
-            # Clear canvas and display image
-            self.thumbnail_canvas.delete("all")
-            
-            # Center image in canvas
-            canvas_width = self.thumbnail_canvas.winfo_width()
-            canvas_height = self.thumbnail_canvas.winfo_height()
-            
-            if canvas_width > 1 and canvas_height > 1:
-                x = canvas_width // 2
-                y = canvas_height // 2
+            if frame is None:
+                frame = self._build_frame(thumbnail_path, cw, ch)
+                self._store_frame(key, frame)
             else:
-                x = 200
-                y = 150
+                self._frame_cache.move_to_end(key)
             
-            self.thumbnail_canvas.create_image(x, y, image=self.preview_image)
+            # Reuse the resident PhotoImage; only reallocate when the canvas size changed.
+            # Keeping the reference on self also stops Tk from losing the image.
+            if self.preview_image is None or self._photo_size != (cw, ch):
+                self.preview_image = ImageTk.PhotoImage('RGB', (cw, ch))
+                self._photo_size = (cw, ch)
+            self.preview_image.paste(frame)
+            self._ui_state = 'content'
+            
+            # Display image centered in canvas
+            self._set_preview_mode('image', image=self.preview_image)
             
         except Exception as e:
             self.show_error(f"Error displaying thumbnail: {e}")
     
+    @staticmethod
+    def _build_frame(thumbnail_path: str, cw: int, ch: int) -> 'Image.Image':
+        """Load a thumbnail, shrink it to the canvas once and center it on a canvas-sized frame
+        
+        Only uses Pillow, so it can run off the Tk thread.
+        """
+        with Image.open(thumbnail_path) as image:
+            image.thumbnail((cw, ch), Image.Resampling.LANCZOS)
+            image = image.convert('RGBA')
+        frame = Image.new('RGB', (cw, ch), 'white')
+        frame.paste(image, ((cw - image.width) // 2, (ch - image.height) // 2), image)
+        return frame
+    
+    def _store_frame(self, key: tuple, frame: 'Image.Image'):
+        """Add a frame to the frame cache, evicting the least recently used"""
+        self._frame_cache[key] = frame
+        self._frame_cache.move_to_end(key)
+        if len(self._frame_cache) > self._frame_cache_size:
+            self._frame_cache.popitem(last=False)
+    
     def show_file_type_icon(self):
         """Show file type icon for non-ICD files"""
         if not self.current_file:
             return
         
-        file_type = self.current_file.get('file_type', '').lower()
+        file_type = self._file_type_lc
         filename = self.current_file.get('filename', 'Unknown')
         
-        # Clear canvas
-        self.thumbnail_canvas.delete("all")
+        state = ('icon', file_type, filename)
+        if self._ui_state == state:
+            return
+        self._ui_state = state
         
         # Show file type icon
-        icon_text = self.get_file_type_icon(file_type)
         description = self.get_file_type_description(file_type)
+        self._set_preview_mode('icon', icon=self.get_file_type_icon(file_type),
+                               description=description, filename=filename)
         
-        # Center text in canvas
-        self.thumbnail_canvas.create_text(200, 120, text=icon_text, 
-                                        font=('TkDefaultFont', 48), fill='gray')
-        self.thumbnail_canvas.create_text(200, 180, text=description, 
-                                        font=('TkDefaultFont', 12), fill='gray')
-        self.thumbnail_canvas.create_text(200, 200, text=filename, 
-                                        font=('TkDefaultFont', 10), fill='darkgray')
-        
-        self.thumbnail_status.config(text=f"File type: {description}")
+        self._set_text(self.thumbnail_status, f"File type: {description}")
     
     def show_error(self, error_message: str):
         """Show error in thumbnail area"""
-        self.thumbnail_canvas.delete("all")
-        self.thumbnail_canvas.create_text(200, 150, text=f"❌ {error_message}", 
-                                        font=('TkDefaultFont', 12), fill='red')
-        self.thumbnail_status.config(text=f"Error: {error_message}")
+        state = ('error', error_message)
+        if self._ui_state == state:
+            return
+        self._ui_state = state
+        
+        self._set_preview_mode('error', message=error_message)
+        self._set_text(self.thumbnail_status, f"Error: {error_message}")
     
     def get_file_type_icon(self, file_type: str) -> str:
         """Get emoji icon for file type"""
-        icons = {
-            '.dwg': '🔧',
-            '.dxf': '📐',
-            '.icad': '⚙️',
-            '.icd': '📋',
-            '.ifc': '🏢',
-            '.step': '⚙️',
-            '.stp': '⚙️',
-            '.pdf': '📄',
-        }
-        return icons.get(file_type, '📄')
+        return _FILE_TYPE_ICONS.get(file_type, '📄')
     
     def get_file_type_description(self, file_type: str) -> str:
         """Get file type description"""
-        descriptions = {
-            '.dwg': 'AutoCAD Drawing',
-            '.dxf': 'AutoCAD Exchange',
-            '.icad': 'ICAD File',
-            '.icd': 'ICAD Document',
-            '.ifc': 'Industry Foundation Classes',
-            '.step': 'STEP 3D Model',
-            '.stp': 'STEP 3D Model',
-            '.pdf': 'PDF Document',
-        }
-        return descriptions.get(file_type, f'{file_type.upper()} File')
+        return _FILE_TYPE_DESCRIPTIONS.get(file_type, f'{file_type.upper()} File')
     
     def refresh_thumbnail(self):
         """Refresh the current thumbnail"""
@@ -361,9 +688,10 @@ class PreviewWidget:
             file_path = self.current_file.get('file_path', '')
             if file_path:
                 # Clear cached thumbnail
-                thumbnail_path = self.screen_capture.get_thumbnail_path(file_path)
-                if thumbnail_path and thumbnail_path.exists():
-                    thumbnail_path.unlink()
+                if self._thumb_stat is not None:
+                    self.screen_capture.discard_thumbnail(self._thumb_path)
+                    self._thumb_stat = None
+                self._last_details_key = None
                 
                 # Regenerate thumbnail
                 self.load_thumbnail()
@@ -373,100 +701,111 @@ class PreviewWidget:
         if not self.current_file:
             return
         
+        # Skip the rebuild if the same file is shown unchanged
+        file_info = self.current_file
+        key = (file_info.get('file_path'), file_info.get('modified_time'), file_info.get('file_size'))
+        if key == self._last_details_key:
+            return
+        self._last_details_key = key
+        
         # Build details text
         details = self.build_details_text()
         
         # Update details text widget
-        self.details_text.config(state=tk.NORMAL)
-        self.details_text.delete(1.0, tk.END)
-        self.details_text.insert(tk.END, details)
-        self.details_text.config(state=tk.DISABLED)
+        with self._batch(self.details_text):
+            self.details_text.replace(1.0, tk.END, details)
+    
+    @contextmanager
+    def _batch(self, text_widget: tk.Text):
+        """Unlock a read-only text widget for one batch of edits"""
+        text_widget.config(state=tk.NORMAL)
+        try:
+            yield text_widget
+        finally:
+            text_widget.config(state=tk.DISABLED)
     
     def build_details_text(self) -> str:
         """Build detailed file information text"""
         file_info = self.current_file
+        file_path = file_info.get('file_path', '')
         
         # Basic file information
-        details = f"📄 {file_info.get('filename', 'Unknown')}\n\n"
+        parts = [f"📄 {file_info.get('filename', 'Unknown')}\n\n"]
         
         # Location
-        details += "📁 Location:\n"
-        details += f"• Path: {file_info.get('file_path', '')}\n"
-        details += f"• Folder: {Path(file_info.get('file_path', '')).parent.name}\n\n"
+        parts.append("📁 Location:\n")
+        parts.append(f"• Path: {file_path}\n")
+        parts.append(f"• Folder: {Path(file_path).parent.name}\n\n")
         
         # File Properties
-        details += "📋 File Information:\n"
-        details += f"• Type: {self.get_file_type_description(file_info.get('file_type', ''))}\n"
-        details += f"• Size: {self.format_file_size(file_info.get('file_size', 0))}\n"
+        parts.append("📋 File Information:\n")
+        parts.append(f"• Type: {self.get_file_type_description(self._file_type_lc)}\n")
+        parts.append(f"• Size: {self.format_file_size(file_info.get('file_size', 0))}\n")
         
         # Timestamps
         modified = file_info.get('modified_time', '')
         if modified:
             if isinstance(modified, str):
-                try:
-                    dt = datetime.fromisoformat(modified.replace('Z', '+00:00'))
-                    modified_str = dt.strftime('%Y-%m-%d %H:%M:%S')
-                except:
-                    modified_str = str(modified)
+                modified_str = _fmt_modified(modified)
+            elif isinstance(modified, datetime):
+                modified_str = modified.strftime('%Y-%m-%d %H:%M:%S')
             else:
                 modified_str = str(modified)
-            details += f"• Modified: {modified_str}\n"
+            parts.append(f"• Modified: {modified_str}\n")
         
-        details += "\n"
+        parts.append("\n")
         
         # Project Information
-        details += "🏗️ Project Information:\n"
-        details += f"• Project: {file_info.get('project_name', 'Not detected')}\n"
-        details += f"• Job: {file_info.get('job_name', 'Not detected')}\n"
-        details += f"• Company: {file_info.get('company_name', 'Not detected')}\n\n"
+        parts.append("🏗️ Project Information:\n")
+        parts.append(f"• Project: {file_info.get('project_name', 'Not detected')}\n")
+        parts.append(f"• Job: {file_info.get('job_name', 'Not detected')}\n")
+        parts.append(f"• Company: {file_info.get('company_name', 'Not detected')}\n\n")
         
         # Thumbnail Information
-        details += "🖼️ Thumbnail Information:\n"
-        file_path = file_info.get('file_path', '')
+        parts.append("🖼️ Thumbnail Information:\n")
         if file_path and file_path.lower().endswith('.icd'):
-            thumbnail_path = self.screen_capture.get_thumbnail_path(file_path)
-            if thumbnail_path and thumbnail_path.exists():
-                details += f"• Status: Cached\n"
-                details += f"• Cache Path: {thumbnail_path}\n"
+            if self._thumb_stat is not None:
+                parts.append("• Status: Cached\n")
+                parts.append(f"• Cache Path: {self._thumb_path}\n")
             else:
-                details += f"• Status: Not generated\n"
-            details += f"• Cache Directory: {self.screen_capture.cache_dir}\n"
+                parts.append("• Status: Not generated\n")
+            parts.append(f"• Cache Directory: {self.screen_capture.cache_dir}\n")
         else:
-            details += f"• Status: Not applicable (not an ICD file)\n"
+            parts.append("• Status: Not applicable (not an ICD file)\n")
         
-        details += "\n"
+        parts.append("\n")
         
         # Actions
-        details += "💡 Actions:\n"
-        details += "• Double-click to open file\n"
-        details += "• Right-click for more options\n"
-        details += "• Use 'Open' button to launch file\n"
-        details += "• Use 'Location' button to open folder\n"
-        details += "• Use '🔄 Refresh' to regenerate thumbnail\n"
+        parts.append(_ACTIONS_BLOCK)
         
-        return details
+        return "".join(parts)
     
     def format_file_size(self, size_bytes: int) -> str:
         """Format file size in human readable format"""
-        if size_bytes == 0:
+        if not size_bytes or size_bytes <= 0:
             return "0 B"
         
-        size_names = ["B", "KB", "MB", "GB"]
-        size = size_bytes
-        i = 0
-        
-        while size >= 1024 and i < len(size_names) - 1:
-            size /= 1024.0
-            i += 1
-        
-        return f"{size:.1f} {size_names[i]}"
+        # Each unit step is 10 bits, capped at GB
+        i = min((int(size_bytes).bit_length() - 1) // 10, 3)
+        return f"{size_bytes / (1 << (10 * i)):.1f} {('B', 'KB', 'MB', 'GB')[i]}"
     
     def show_empty_state(self):
         """Show empty state when no file is selected"""
+        self._cancel_pending_preview()
+        self._supersede_thumbnail_job()
+        if self._ui_state == 'empty':
+            return
+        self._ui_state = 'empty'
+        
         self.current_file = None
+        self._file_type_lc = ''
+        self._last_details_key = None
+        self._src_stat = None
+        self._thumb_path = None
+        self._thumb_stat = None
         
         # Update header
-        self.filename_label.config(text="No file selected")
+        self._set_text(self.filename_label, "No file selected")
         
         # Disable action buttons
         self.open_btn.config(state=tk.DISABLED)
@@ -474,22 +813,18 @@ class PreviewWidget:
         self.refresh_btn.config(state=tk.DISABLED)
         
         # Clear thumbnail canvas
-        self.thumbnail_canvas.delete("all")
-        self.thumbnail_canvas.create_text(200, 150, text="Select a file to preview", 
-                                        font=('TkDefaultFont', 12), fill='gray')
+        self._set_preview_mode('empty')
         
         # Update status
-        self.thumbnail_status.config(text="No file selected")
+        self._set_text(self.thumbnail_status, "No file selected")
         
         # Clear details
-        self.details_text.config(state=tk.NORMAL)
-        self.details_text.delete(1.0, tk.END)
-        self.details_text.insert(tk.END, "Select a file to view details...")
-        self.details_text.config(state=tk.DISABLED)
+        with self._batch(self.details_text):
+            self.details_text.replace(1.0, tk.END, "Select a file to view details...")
         
         # Update footer
-        self.status_label.config(text="No file selected")
-        self.size_label.config(text="")
+        self._set_text(self.status_label, "No file selected")
+        self._set_text(self.size_label, "")
     
     def clear_preview(self):
         """Clear the preview"""
@@ -499,13 +834,9 @@ class PreviewWidget:
         """Open the current file"""
         if self.current_file:
             file_path = self.current_file.get('file_path', '')
-            if file_path and Path(file_path).exists():
-                try:
-                    os.startfile(file_path)  # Windows
-                except AttributeError:
-                    os.system(f'xdg-open "{file_path}"')  # Linux
-                except Exception as e:
-                    messagebox.showerror("Error", f"Failed to open file: {e}")
+            # Check the file now; the selection's stat may be stale or still pending
+            if file_path and os.path.exists(file_path):
+                self._launch(file_path, "Failed to open file")
             else:
                 messagebox.showwarning("File Not Found", "Selected file no longer exists.")
     
@@ -513,16 +844,34 @@ class PreviewWidget:
         """Open file location"""
         if self.current_file:
             file_path = self.current_file.get('file_path', '')
-            if file_path and Path(file_path).exists():
-                try:
-                    os.startfile(Path(file_path).parent)  # Windows
-                except AttributeError:
-                    os.system(f'xdg-open "{Path(file_path).parent}"')  # Linux
-                except Exception as e:
-                    messagebox.showerror("Error", f"Failed to open location: {e}")
+            # Check the file now; the selection's stat may be stale or still pending
+            if file_path and os.path.exists(file_path):
+                self._launch(str(Path(file_path).parent), "Failed to open location")
             else:
                 messagebox.showwarning("File Not Found", "Selected file no longer exists.")
     
+    def _launch(self, target: str, error_message: str):
+        """Open a file or folder with the system's default application"""
+        try:
+            os.startfile(target)  # Windows
+            return
+        except AttributeError:
+            pass  # Not Windows
+        except FileNotFoundError:
+            messagebox.showwarning("File Not Found", "Selected file no longer exists.")
+            return
+        except Exception as e:
+            messagebox.showerror("Error", f"{error_message}: {e}")
+            return
+        
+        try:
+            subprocess.Popen(["xdg-open", target], start_new_session=True,
+                             stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)  # Linux
+        except FileNotFoundError:
+            messagebox.showerror("Error", f"{error_message}: no launcher found (xdg-open is not installed)")
+        except Exception as e:
+            messagebox.showerror("Error", f"{error_message}: {e}")
+    
     def refresh_preview(self):
         """Refresh the current preview"""
         if self.current_file:
@@ -7,10 +7,71 @@ import tkinter as tk
 from tkinter import ttk
 from typing import List, Dict, Any, Callable, Optional
 import re
+from collections import OrderedDict
+from functools import lru_cache
+
+try:
+    import re2
+    RE2_AVAILABLE = True
+except ImportError:
+    re2 = None
+    RE2_AVAILABLE = False
 
 from core.search_engine import SearchEngine
 from config.settings import Settings
 
+# Bytes per size unit offered by the min/max unit combos
+_SIZE_MULTIPLIERS = {
+    'B': 1,
+    'KB': 1 << 10,
+    'MB': 1 << 20,
+    'GB': 1 << 30,
+}
+
+# Three octal digits after a backslash are a character code, not a group reference
+_OCTAL_ESCAPE = re.compile(r'[0-7]{3}')
+
+def _lower_pattern(pattern: str) -> Optional[str]:
+    """Lowercase a regex for matching pre-lowered text, or None if that isn't safe
+    
+    Escaped characters are kept verbatim since their case matters (\\d vs \\D).
+    Escapes that spell a character by code (\\x41, \\101, \\N{...}) may denote
+    an uppercase letter, so those patterns need IGNORECASE instead. So do
+    patterns with (?...) extensions, whose group names and flags are
+    case-sensitive syntax.
+    """
+    if '(?' in pattern:
+        return None
+    
+    parts = []
+    i = 0
+    while i < len(pattern):
+        char = pattern[i]
+        if char == '\\' and i + 1 < len(pattern):
+            escaped = pattern[i + 1]
+            if escaped in 'xuUN0' or _OCTAL_ESCAPE.match(pattern, i + 1):
+                return None
+            parts.append(char + escaped)
+            i += 2
+        else:
+            parts.append(char.lower())
+            i += 1
+    return ''.join(parts)
+
+@lru_cache(maxsize=128)
+def _compile(pattern: str, flags: int):
+    """Compile a regex once per (pattern, flags) pair
+    
+    Uses linear-time RE2 when installed (pip install google-re2) so a
+    pathological user pattern can't freeze the UI with backtracking.
+    """
+    if RE2_AVAILABLE:
+        try:
+            return re2.compile(f"(?i){pattern}" if flags & re.IGNORECASE else pattern)
+        except re2.error:
+            pass  # Syntax RE2 doesn't support, e.g. backreferences
+    return re.compile(pattern, flags)
+
 class SearchWidget:
     """Search widget for finding ICAD files"""
     
@@ -28,6 +89,14 @@ class SearchWidget:
         # Search delay timer
         self.search_timer = None
         
+        # Filters parsed from the advanced options, rebuilt only after they change
+        self._cached_filters = {}
+        self._filters_dirty = True
+        
+        # Recent results keyed by the full search state, least recently used first
+        self._result_cache = OrderedDict()
+        self._result_cache_size = 32
+        
         # Setup UI
         self.setup_ui()
         self.setup_bindings()
@@ -117,7 +186,7 @@ class SearchWidget:
             var = tk.BooleanVar(value=True)
             self.filetype_vars[file_type] = var
             cb = ttk.Checkbutton(filetype_frame, text=file_type, variable=var,
-                               command=self.perform_search)
+                               command=self.on_filter_toggle)
             cb.grid(row=i//3, column=i%3, sticky=tk.W, padx=5, pady=2)
         
         # Date range filters
@@ -129,7 +198,8 @@ class SearchWidget:
         date_from_frame.pack(fill=tk.X, pady=(0, 5))
         
         ttk.Label(date_from_frame, text="From:").pack(side=tk.LEFT)
-        self.date_from_entry = ttk.Entry(date_from_frame, width=12)
+        self.date_from_var = tk.StringVar()
+        self.date_from_entry = ttk.Entry(date_from_frame, textvariable=self.date_from_var, width=12)
         self.date_from_entry.pack(side=tk.LEFT, padx=(5, 0))
         ttk.Label(date_from_frame, text="(YYYY-MM-DD)").pack(side=tk.LEFT, padx=(5, 0))
         
@@ -138,7 +208,8 @@ class SearchWidget:
         date_to_frame.pack(fill=tk.X)
         
         ttk.Label(date_to_frame, text="To:").pack(side=tk.LEFT)
-        self.date_to_entry = ttk.Entry(date_to_frame, width=12)
+        self.date_to_var = tk.StringVar()
+        self.date_to_entry = ttk.Entry(date_to_frame, textvariable=self.date_to_var, width=12)
         self.date_to_entry.pack(side=tk.LEFT, padx=(5, 0))
         ttk.Label(date_to_frame, text="(YYYY-MM-DD)").pack(side=tk.LEFT, padx=(5, 0))
         
@@ -151,11 +222,13 @@ class SearchWidget:
         size_min_frame.pack(fill=tk.X, pady=(0, 5))
         
         ttk.Label(size_min_frame, text="Min size:").pack(side=tk.LEFT)
-        self.size_min_entry = ttk.Entry(size_min_frame, width=10)
+        self.size_min_var = tk.StringVar()
+        self.size_min_entry = ttk.Entry(size_min_frame, textvariable=self.size_min_var, width=10)
         self.size_min_entry.pack(side=tk.LEFT, padx=(5, 0))
         
+        self.size_min_unit_var = tk.StringVar()
         self.size_min_unit = ttk.Combobox(size_min_frame, values=["B", "KB", "MB", "GB"], 
-                                         state="readonly", width=5)
+                                         textvariable=self.size_min_unit_var, state="readonly", width=5)
         self.size_min_unit.pack(side=tk.LEFT, padx=(5, 0))
         self.size_min_unit.set("KB")
         
@@ -164,11 +237,13 @@ class SearchWidget:
         size_max_frame.pack(fill=tk.X)
         
         ttk.Label(size_max_frame, text="Max size:").pack(side=tk.LEFT)
-        self.size_max_entry = ttk.Entry(size_max_frame, width=10)
+        self.size_max_var = tk.StringVar()
+        self.size_max_entry = ttk.Entry(size_max_frame, textvariable=self.size_max_var, width=10)
         self.size_max_entry.pack(side=tk.LEFT, padx=(5, 0))
         
+        self.size_max_unit_var = tk.StringVar()
         self.size_max_unit = ttk.Combobox(size_max_frame, values=["B", "KB", "MB", "GB"], 
-                                         state="readonly", width=5)
+                                         textvariable=self.size_max_unit_var, state="readonly", width=5)
         self.size_max_unit.pack(side=tk.LEFT, padx=(5, 0))
         self.size_max_unit.set("MB")
     
@@ -207,6 +282,7 @@ class SearchWidget:
         self.recent_combo.bind('<<ComboboxSelected>>', self.on_recent_selected)
         
         # Load recent searches
+        self._recent = OrderedDict()
         self.load_recent_searches()
     
     def setup_bindings(self):
@@ -218,11 +294,20 @@ class SearchWidget:
         # Filter change
         self.filter_combo.bind('<<ComboboxSelected>>', lambda e: self.perform_search())
         
-        # Advanced option changes
+        # Any write to a filter input, however it happens (typing, pasting,
+        # code), invalidates the cached filters
+        filter_vars = [self.date_from_var, self.date_to_var, self.size_min_var, self.size_max_var,
+                       self.size_min_unit_var, self.size_max_unit_var, *self.filetype_vars.values()]
+        for var in filter_vars:
+            var.trace_add('write', self.on_filter_change)
+        
+        # Advanced option edits search again after the usual delay
         self.date_from_entry.bind('<KeyRelease>', self.on_search_change)
         self.date_to_entry.bind('<KeyRelease>', self.on_search_change)
         self.size_min_entry.bind('<KeyRelease>', self.on_search_change)
         self.size_max_entry.bind('<KeyRelease>', self.on_search_change)
+        self.size_min_unit.bind('<<ComboboxSelected>>', self.on_search_change)
+        self.size_max_unit.bind('<<ComboboxSelected>>', self.on_search_change)
         
         # Focus events
         self.search_entry.bind('<FocusIn>', self.on_search_focus)
@@ -230,6 +315,9 @@ class SearchWidget:
     
     def toggle_advanced(self):
         """Toggle advanced options visibility"""
+        # File type filters only apply while the options are shown
+        self._filters_dirty = True
+        
         if self.advanced_visible.get():
             self.advanced_frame.pack_forget()
             self.advanced_btn.config(text="▼ Advanced")
@@ -241,6 +329,10 @@ class SearchWidget:
     
     def on_search_change(self, event=None):
         """Handle search text change with delay"""
+        # Return already searched immediately via its own binding
+        if event is not None and event.keysym == 'Return':
+            return
+        
         # Cancel previous timer
         if self.search_timer:
             self.parent.after_cancel(self.search_timer)
@@ -248,6 +340,14 @@ class SearchWidget:
         # Set new timer
         self.search_timer = self.parent.after(Settings.SEARCH_DELAY_MS, self.perform_search)
     
+    def on_filter_change(self, *args):
+        """Mark the cached filters stale when a filter variable is written"""
+        self._filters_dirty = True
+    
+    def on_filter_toggle(self):
+        """Handle a file type checkbox toggle"""
+        self.perform_search()
+    
     def on_search_focus(self, event=None):
         """Handle search entry focus"""
         # Show suggestions or help text
@@ -260,23 +360,45 @@ class SearchWidget:
     
     def perform_search(self):
         """Perform search based on current settings"""
+        # A search run directly (Return, option toggles) supersedes a pending delayed one
+        if self.search_timer:
+            self.parent.after_cancel(self.search_timer)
+            self.search_timer = None
+        
         query = self.search_var.get().strip()
         filter_type = self.filter_var.get()
         
         # Build filters
         filters = self.build_filters()
         
-        # Perform search
-        if self.regex_var.get():
-            results = self.search_with_regex(query, filters)
+        # Nothing to search for, e.g. right after Clear All
+        if not query and not filters and filter_type == "All" and not self.regex_var.get():
+            self.callback(self.search_engine.default_result_set())
+            return
+        
+        # Reuse results when the user returns to an earlier search
+        key = (query, filter_type, self.case_sensitive_var.get(), self.regex_var.get(),
+               frozenset(filters.items()),
+               self.search_engine.db_manager.generation)
+        results = self._result_cache.get(key)
+        
+        if results is not None:
+            self._result_cache.move_to_end(key)
         else:
-            if filter_type == "All" and filters:
-                results = self.search_engine.search(query, filters)
+            # Perform search
+            if self.regex_var.get():
+                results = self.search_with_regex(query, filters)
             else:
-                results = self.search_engine.quick_search(query, filter_type)
-                # Apply additional filters
-                if filters:
-                    results = self.apply_filters(results, filters)
+                if filter_type == "All" and filters:
+                    results = self.search_engine.search(query, filters)
+                elif filters:
+                    results = self.search_engine.search_filtered(query, filter_type, filters)
+                else:
+                    results = self.search_engine.quick_search(query, filter_type)
+            
+            self._result_cache[key] = results
+            if len(self._result_cache) > self._result_cache_size:
+                self._result_cache.popitem(last=False)
         
         # Add to recent searches
         if query:
@@ -286,14 +408,17 @@ class SearchWidget:
         self.callback(results)
     
     def build_filters(self) -> Dict[str, Any]:
-        """Build filters dictionary from UI"""
+        """Build filters dictionary from UI, reusing the last one if nothing changed"""
+        if not self._filters_dirty:
+            return self._cached_filters
+        
         filters = {}
         
         # File type filters
         if self.advanced_visible.get():
             selected_types = [ft for ft, var in self.filetype_vars.items() if var.get()]
             if selected_types and len(selected_types) < len(self.filetype_vars):
-                filters['file_types'] = selected_types
+                filters['file_types'] = frozenset(ft.lower() for ft in selected_types)
         
         # Date range filters
         date_from = self.date_from_entry.get().strip()
@@ -331,17 +456,13 @@ class SearchWidget:
             except ValueError:
                 pass
         
+        self._cached_filters = filters
+        self._filters_dirty = False
         return filters
     
     def convert_size_to_bytes(self, size: float, unit: str) -> int:
         """Convert size to bytes"""
-        multipliers = {
-            'B': 1,
-            'KB': 1024,
-            'MB': 1024 * 1024,
-            'GB': 1024 * 1024 * 1024
-        }
-        return int(size * multipliers.get(unit, 1))
+        return int(size * _SIZE_MULTIPLIERS[unit])
     
     def search_with_regex(self, query: str, filters: Dict[str, Any]) -> List[Dict[str, Any]]:
         """Perform regex search"""
@@ -349,26 +470,27 @@ class SearchWidget:
             return []
         
         try:
-            # Compile regex pattern
-            flags = 0 if self.case_sensitive_var.get() else re.IGNORECASE
-            pattern = re.compile(query, flags)
+            # Compile regex pattern. Case-insensitive searches run against the
+            # pre-lowered text with a lowered pattern, which is cheaper than
+            # IGNORECASE folding every character.
+            case_sensitive = self.case_sensitive_var.get()
+            lowered = None if case_sensitive else _lower_pattern(query)
+            if case_sensitive:
+                pattern = _compile(query, 0)
+            elif lowered is None:
+                pattern = _compile(query, re.IGNORECASE)
+            else:
+                pattern = _compile(lowered, 0)
             
-            # Get all files
-            all_files = self.search_engine.db_manager.get_all_files()
+            # Get candidate files; filters narrow them down in SQL
+            all_files = self.search_engine.get_all_files()
+            if filters:
+                matching_ids = self.search_engine.filter_file_ids(filters)
+                all_files = [f for f in all_files if f['id'] in matching_ids]
             
             # Filter by regex
-            results = []
-            for file_info in all_files:
-                # Create searchable text
-                searchable_text = self.create_searchable_text(file_info)
-                
-                # Check if pattern matches
-                if pattern.search(searchable_text):
-                    results.append(file_info)
-            
-            # Apply additional filters
-            if filters:
-                results = self.apply_filters(results, filters)
+            blob_key = '_blob' if case_sensitive else '_blob_lower'
+            results = [f for f in all_files if pattern.search(f[blob_key])]
             
             return results
             
@@ -376,86 +498,6 @@ class SearchWidget:
             # Invalid regex, fall back to normal search
             return self.search_engine.quick_search(query, self.filter_var.get())
     
-    def create_searchable_text(self, file_info: Dict[str, Any]) -> str:
-        """Create searchable text from file info"""
-        text_parts = [
-            file_info.get('filename', ''),
-            file_info.get('project_name', ''),
-            file_info.get('job_name', ''),
-            file_info.get('company_name', ''),
-        ]
-        
-        text = ' '.join(str(part) for part in text_parts if part)
-        return text if self.case_sensitive_var.get() else text.lower()
-    
-    def apply_filters(self, files: List[Dict[str, Any]], filters: Dict[str, Any]) -> List[Dict[str, Any]]:
-        """Apply filters to file list"""
-        filtered_files = files
-        
-        # File type filter
-        if 'file_types' in filters:
-            file_types = [ft.lower() for ft in filters['file_types']]
-            filtered_files = [f for f in filtered_files if f.get('file_type', '').lower() in file_types]
-        
-        # Date filters
-        if 'date_from' in filters or 'date_to' in filters:
-            filtered_files = self.filter_by_date(filtered_files, filters)
-        
-        # Size filters
-        if 'size_min' in filters or 'size_max' in filters:
-            filtered_files = self.filter_by_size(filtered_files, filters)
-        
-        return filtered_files
-    
-    def filter_by_date(self, files: List[Dict[str, Any]], filters: Dict[str, Any]) -> List[Dict[str, Any]]:
-        """Filter files by date"""
-        from datetime import datetime
-        
-        filtered_files = []
-        date_from = filters.get('date_from')
-        date_to = filters.get('date_to')
-        
-        for file_info in files:
-            file_date = file_info.get('modified_time')
-            
-            if isinstance(file_date, str):
-                try:
-                    file_date = datetime.fromisoformat(file_date.replace('Z', '+00:00'))
-                except:
-                    continue
-            
-            if not isinstance(file_date, datetime):
-                continue
-            
-            # Check date range
-            if date_from and file_date < date_from:
-                continue
-            if date_to and file_date > date_to:
-                continue
-            
-            filtered_files.append(file_info)
-        
-        return filtered_files
-    
-    def filter_by_size(self, files: List[Dict[str, Any]], filters: Dict[str, Any]) -> List[Dict[str, Any]]:
-        """Filter files by size"""
-        filtered_files = []
-        size_min = filters.get('size_min')
-        size_max = filters.get('size_max')
-        
-        for file_info in files:
-            file_size = file_info.get('file_size', 0)
-            
-            # Check size range
-            if size_min and file_size < size_min:
-                continue
-            if size_max and file_size > size_max:
-                continue
-            
-            filtered_files.append(file_info)
-        
-        return filtered_files
-    
     def apply_quick_filter(self, filter_type: str):
         """Apply quick filter"""
         from datetime import datetime, timedelta
@@ -521,23 +563,27 @@ class SearchWidget:
     
     def load_facets(self):
         """Load search facets from database"""
-        # This would load available projects, companies, etc.
-        pass
+        # Warm the substring index so the first keystroke doesn't pay for it
+        self.search_engine.build_index()
     
     def load_recent_searches(self):
         """Load recent searches"""
         # This would load from config
         recent_searches = ["drawing", "project_a", "company_x"]  # Placeholder
-        self.recent_combo['values'] = recent_searches
+        self._recent = OrderedDict.fromkeys(recent_searches)
+        self.recent_combo['values'] = tuple(self._recent)
     
     def add_recent_search(self, query: str):
         """Add search to recent searches"""
         if query and len(query) > 2:
-            current_values = list(self.recent_combo['values'])
-            if query in current_values:
-                current_values.remove(query)
-            current_values.insert(0, query)
-            self.recent_combo['values'] = current_values[:10]  # Keep only last 10
+            if query in self._recent and next(iter(self._recent)) == query:
+                return  # Already the most recent, nothing to update
+            
+            self._recent[query] = None
+            self._recent.move_to_end(query, last=False)
+            while len(self._recent) > 10:  # Keep only last 10
+                self._recent.popitem(last=True)
+            self.recent_combo['values'] = tuple(self._recent)
     
     def on_recent_selected(self, event):
         """Handle recent search selection"""
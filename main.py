@@ -10,9 +10,12 @@ import os
 import sys
 from datetime import datetime
 import threading
+import queue
 import time
 import re
+import json
 from typing import List, Dict, Any, Optional
+from concurrent.futures import ThreadPoolExecutor
 
 # Import the screen capture system
 from icad_screen_capture import ICADScreenCapture, ThumbnailWorker
@@ -33,6 +36,9 @@ class Settings:
     MIN_WINDOW_WIDTH = 1000
     MIN_WINDOW_HEIGHT = 700
     
+    # Per-user index of parsed file metadata, reused by later scans
+    FILE_INDEX_PATH = Path.home() / ".icad_file_manager" / "file_index.json"
+    
     @classmethod
     def is_supported_file(cls, file_path: str) -> bool:
         """Check if file is supported"""
@@ -44,19 +50,43 @@ class Settings:
         ext = Path(file_path).suffix.lower()
         return cls.ICAD_EXTENSIONS.get(ext, 'Unknown')
 
+# Common patterns for drawing numbers, in order of preference
+_DRAWING_NUMBER_PATTERNS = tuple(re.compile(pattern) for pattern in (
+    r'([A-Z]{1,3}-?\d{3,6})',  # A-123456 or ABC123456
+    r'(\d{4,6})',              # 123456
+    r'([A-Z]\d{2,4})',         # A123
+))
+
+# Revision patterns, in order of preference
+_REVISION_PATTERNS = tuple(re.compile(pattern) for pattern in (
+    r'[_-]?[Rr]ev?[_-]?([A-Z0-9]+)',  # Rev A, Rev1, R01
+    r'[_-]?[Vv]([0-9]+)',             # V1, V01
+    r'[_-]?([A-Z])$',                 # Ending with single letter
+))
+
 class FileInfo:
     """File information container"""
     
-    def __init__(self, file_path: Path):
+    __slots__ = (
+        'path', 'name', 'stem', 'suffix', 'parent', 'type_description',
+        'size', 'modified', 'created', 'modified_str',
+        'project_name', 'job_name', 'company_name', 'drawing_number', 'revision',
+        '_search_fields',
+    )
+    
+    def __init__(self, file_path: Path, stat: Optional[os.stat_result] = None,
+                 metadata: Optional[tuple] = None):
         self.path = file_path
         self.name = file_path.name
         self.stem = file_path.stem
         self.suffix = file_path.suffix.lower()
         self.parent = file_path.parent
+        self.type_description = Settings.ICAD_EXTENSIONS.get(self.suffix, 'Unknown')
         
         # Get file stats
         try:
-            stat = file_path.stat()
+            if stat is None:
+                stat = file_path.stat()
             self.size = stat.st_size
             self.modified = datetime.fromtimestamp(stat.st_mtime)
             self.created = datetime.fromtimestamp(stat.st_ctime)
@@ -64,13 +94,28 @@ class FileInfo:
             self.size = 0
             self.modified = datetime.now()
             self.created = datetime.now()
+        self.modified_str = self.modified.strftime('%Y-%m-%d %H:%M')
         
-        # Extract metadata from filename and path
-        self.project_name = self._extract_project_name()
-        self.job_name = self._extract_job_name()
-        self.company_name = self._extract_company_name()
-        self.drawing_number = self._extract_drawing_number()
-        self.revision = self._extract_revision()
+        # Extract metadata from filename and path, unless an earlier scan did
+        if metadata:
+            (self.project_name, self.job_name, self.company_name,
+             self.drawing_number, self.revision) = metadata
+        else:
+            self.project_name = self._extract_project_name()
+            self.job_name = self._extract_job_name()
+            self.company_name = self._extract_company_name()
+            self.drawing_number = self._extract_drawing_number()
+            self.revision = self._extract_revision()
+        
+        # Lowercased text for each search type, so searching is a substring test
+        self._search_fields = {
+            'Filename': self.name.lower(),
+            'Project': self.project_name.lower(),
+            'Job': self.job_name.lower(),
+            'Company': self.company_name.lower(),
+            'Drawing': self.drawing_number.lower(),
+            'All': f"{self.name} {self.project_name} {self.job_name} {self.company_name} {self.drawing_number}".lower(),
+        }
     
     def _extract_project_name(self) -> str:
         """Extract project name from path/filename"""
@@ -111,15 +156,9 @@ class FileInfo:
     
     def _extract_drawing_number(self) -> str:
         """Extract drawing number from filename"""
-        # Common patterns for drawing numbers
-        patterns = [
-            r'([A-Z]{1,3}-?\d{3,6})',  # A-123456 or ABC123456
-            r'(\d{4,6})',              # 123456
-            r'([A-Z]\d{2,4})',         # A123
-        ]
-        
-        for pattern in patterns:
-            match = re.search(pattern, self.stem.upper())
+        stem_upper = self.stem.upper()
+        for pattern in _DRAWING_NUMBER_PATTERNS:
+            match = pattern.search(stem_upper)
             if match:
                 return match.group(1)
         
@@ -127,39 +166,25 @@ class FileInfo:
     
     def _extract_revision(self) -> str:
         """Extract revision from filename"""
-        patterns = [
-            r'[_-]?[Rr]ev?[_-]?([A-Z0-9]+)',  # Rev A, Rev1, R01
-            r'[_-]?[Vv]([0-9]+)',             # V1, V01
-            r'[_-]?([A-Z])$',                 # Ending with single letter
-        ]
-        
-        for pattern in patterns:
-            match = re.search(pattern, self.stem)
+        for pattern in _REVISION_PATTERNS:
+            match = pattern.search(self.stem)
             if match:
                 return match.group(1)
         
         return ""
     
+    def search_text(self, search_type: str = 'All') -> str:
+        """Lowercase text that searches of this type match against"""
+        fields = self._search_fields
+        return fields.get(search_type, fields['All'])
+    
     def matches_search(self, query: str, search_type: str) -> bool:
-        """Check if file matches search query"""
+        """Check if file matches search query (query must already be lowercase)"""
         if not query:
             return True
         
-        query = query.lower()
-        
-        if search_type == "Filename":
-            return query in self.name.lower()
-        elif search_type == "Project":
-            return query in self.project_name.lower()
-        elif search_type == "Job":
-            return query in self.job_name.lower()
-        elif search_type == "Company":
-            return query in self.company_name.lower()
-        elif search_type == "Drawing":
-            return query in self.drawing_number.lower()
-        else:  # All
-            searchable_text = f"{self.name} {self.project_name} {self.job_name} {self.company_name} {self.drawing_number}".lower()
-            return query in searchable_text
+        fields = self._search_fields
+        return query in fields.get(search_type, fields['All'])
     
     def format_size(self) -> str:
         """Format file size"""
@@ -176,20 +201,112 @@ class FileInfo:
         
         return f"{size:.1f} {size_names[i]}"
 
+class FileIndexCache:
+    """Persistent index of extracted file metadata, so rescans only re-parse files that changed
+    
+    Entries are plain JSON data keyed by path, and are only reused while the
+    file's mtime and size match what was recorded. Entries under a scanned
+    folder that the scan didn't see are dropped.
+    """
+    
+    VERSION = 1
+    
+    def __init__(self, index_path: Path):
+        self.index_path = index_path
+        self._entries = {}
+        self._seen = set()
+        self._loaded = False
+        self._dirty = False
+        self._lock = threading.Lock()
+    
+    def load(self):
+        """Read the index from disk, once"""
+        with self._lock:
+            if self._loaded:
+                return
+            self._loaded = True
+            
+            try:
+                with open(self.index_path, encoding='utf-8') as f:
+                    data = json.load(f)
+                if data.get("version") == self.VERSION:
+                    self._entries = {path: tuple(entry) for path, entry in data["entries"].items()}
+            except FileNotFoundError:
+                pass
+            except (OSError, ValueError, KeyError, TypeError, AttributeError) as e:
+                print(f"Could not load file index: {e}")
+    
+    def lookup(self, path: str, mtime: float, size: int) -> Optional[tuple]:
+        """Return the metadata recorded for path if the file is unchanged"""
+        self._seen.add(path)
+        entry = self._entries.get(path)
+        if entry and len(entry) == 7 and entry[0] == mtime and entry[1] == size:
+            return entry[2:]
+        return None
+    
+    def put(self, path: str, mtime: float, size: int, file_info: FileInfo):
+        """Record the metadata of a freshly parsed file"""
+        with self._lock:
+            self._entries[path] = (mtime, size, file_info.project_name, file_info.job_name,
+                                   file_info.company_name, file_info.drawing_number, file_info.revision)
+            self._dirty = True
+    
+    def prune(self, root: str):
+        """Drop entries under root that weren't looked up since the last prune"""
+        prefix = os.path.join(root, '')
+        with self._lock:
+            stale = [path for path in self._entries
+                     if path.startswith(prefix) and path not in self._seen]
+            for path in stale:
+                del self._entries[path]
+            if stale:
+                self._dirty = True
+            self._seen = set()
+    
+    def save(self):
+        """Write the index to disk if anything changed since the last save"""
+        with self._lock:
+            if not self._dirty:
+                return
+            self._dirty = False
+            data = {"version": self.VERSION, "entries": dict(self._entries)}
+        
+        tmp_path = self.index_path.with_name(f"{self.index_path.name}.{os.getpid()}.tmp")
+        try:
+            self.index_path.parent.mkdir(parents=True, exist_ok=True)
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(data, f)
+            os.replace(tmp_path, self.index_path)
+        except OSError as e:
+            print(f"Could not save file index: {e}")
+            with self._lock:
+                self._dirty = True
+            try:
+                tmp_path.unlink()
+            except OSError:
+                pass
+
 class ICADFileExplorer:
     """Main ICAD File Explorer Application with Screen Capture Thumbnails"""
     
     def __init__(self):
         self.current_folder = None
         self.all_files = []
+        self._trigram_index = {}
         self.filtered_files = []
+        self._last_query_sig = None
         self.selected_file = None
         self.search_timer = None
         self.scan_thread = None
         
+        # Lists directories in parallel during scans; kept for later rescans
+        self._scan_executor = ThreadPoolExecutor(max_workers=32, thread_name_prefix="scan")
+        
         # Initialize screen capture system
         self.screen_capture = ICADScreenCapture()
-        self.thumbnail_worker = None
+        self.thumbnail_worker = ThumbnailWorker(self.screen_capture)
+        self.thumbnail_worker.start()
+        self.file_index_cache = FileIndexCache(Settings.FILE_INDEX_PATH)
         self.current_thumbnail_image = None
         
         # Setup GUI
@@ -522,33 +639,113 @@ Ready to see your 3D models instantly? Select a project folder to begin!"""
     def _scan_folder_thread(self):
         """Background thread for folder scanning"""
         try:
-            files = []
-            
             # Scan folder recursively
-            for file_path in self.current_folder.rglob("*"):
-                if file_path.is_file() and Settings.is_supported_file(str(file_path)):
-                    try:
-                        file_info = FileInfo(file_path)
-                        files.append(file_info)
-                    except Exception as e:
-                        print(f"Error processing {file_path}: {e}")
+            self.file_index_cache.load()
+            files = self._scan_tree(self.current_folder)
+            self.file_index_cache.prune(str(self.current_folder))
+            threading.Thread(target=self.file_index_cache.save, daemon=True).start()
             
             # Sort files by name
             files.sort(key=lambda f: f.name.lower())
             
+            trigram_index = self._build_trigram_index(files)
+            
             # Update UI in main thread
-            self.root.after(0, lambda: self._scan_complete(files))
+            self.root.after(0, lambda: self._scan_complete(files, trigram_index))
             
         except Exception as e:
             self.root.after(0, lambda: self._scan_error(str(e)))
     
-    def _scan_complete(self, files: List[FileInfo]):
+    def _scan_tree(self, root: Path) -> List[FileInfo]:
+        """Build a FileInfo for every supported file under root
+        
+        Each directory is listed by os.scandir on the scan pool, so on
+        network shares many directory listings and stats are in flight at
+        once. File type and stat info come from the listing, and only
+        supported files ever become a Path. Files whose mtime and size match
+        the file index cache reuse its metadata instead of re-parsing names.
+        """
+        found = queue.Queue()
+        pending = 0
+        done = threading.Condition()
+        
+        def submit(directory: str):
+            nonlocal pending
+            with done:
+                pending += 1
+            self._scan_executor.submit(scan_dir, directory)
+        
+        def scan_dir(directory: str):
+            nonlocal pending
+            try:
+                with os.scandir(directory) as entries:
+                    for entry in entries:
+                        if entry.is_dir(follow_symlinks=False):
+                            submit(entry.path)
+                        elif os.path.splitext(entry.name)[1].lower() in Settings.ICAD_EXTENSIONS and entry.is_file():
+                            try:
+                                stat = entry.stat()
+                                metadata = self.file_index_cache.lookup(entry.path, stat.st_mtime, stat.st_size)
+                                file_info = FileInfo(Path(entry.path), stat, metadata)
+                                if metadata is None:
+                                    self.file_index_cache.put(entry.path, stat.st_mtime, stat.st_size, file_info)
+                                found.put(file_info)
+                            except Exception as e:
+                                print(f"Error processing {entry.path}: {e}")
+            except OSError as e:
+                print(f"Error scanning {directory}: {e}")
+            finally:
+                with done:
+                    pending -= 1
+                    if pending == 0:
+                        done.notify_all()
+        
+        submit(str(root))
+        with done:
+            done.wait_for(lambda: pending == 0)
+        
+        files = []
+        while not found.empty():
+            files.append(found.get_nowait())
+        return files
+    
+    def _build_trigram_index(self, files: List[FileInfo]) -> Dict[str, set]:
+        """Map every 3-character substring of the 'All' search text to the files containing it"""
+        index = {}
+        for i, file_info in enumerate(files):
+            text = file_info.search_text()
+            for trigram in {text[j:j + 3] for j in range(len(text) - 2)}:
+                index.setdefault(trigram, set()).add(i)
+        return index
+    
+    def _search_trigram_index(self, query: str) -> List[FileInfo]:
+        """Find files whose 'All' text contains query (lowercase)"""
+        # Too short to have a trigram; every file is a candidate
+        if len(query) < 3:
+            return [f for f in self.all_files if query in f.search_text()]
+        
+        postings = []
+        for trigram in {query[j:j + 3] for j in range(len(query) - 2)}:
+            posting = self._trigram_index.get(trigram)
+            if not posting:
+                return []
+            postings.append(posting)
+        
+        # Intersect from the rarest trigram up, then confirm the trigrams are contiguous
+        postings.sort(key=len)
+        candidates = postings[0].intersection(*postings[1:])
+        return [self.all_files[i] for i in sorted(candidates)
+                if query in self.all_files[i].search_text()]
+    
+    def _scan_complete(self, files: List[FileInfo], trigram_index: Dict[str, set]):
         """Handle scan completion"""
         self.progress_bar.stop()
         self.progress_bar.pack_forget()
         self.ready_label.config(text="Ready")
         
         self.all_files = files
+        self._trigram_index = trigram_index
+        self._last_query_sig = None
         self.apply_filters()
         
         count = len(files)
@@ -575,15 +772,15 @@ Ready to see your 3D models instantly? Select a project folder to begin!"""
         total_size = 0
         
         for file_info in self.all_files:
-            file_type = Settings.get_file_type_description(str(file_info.path))
+            file_type = file_info.type_description
             type_counts[file_type] = type_counts.get(file_type, 0) + 1
             total_size += file_info.size
         
         # Check for cached thumbnails
         cached_thumbnails = 0
         for file_info in self.all_files:
-            thumbnail_path = self.screen_capture.get_thumbnail_path(str(file_info.path))
-            if thumbnail_path and thumbnail_path.exists():
+            thumbnail_path = self.screen_capture.get_thumbnail_path(str(file_info.path), hash_content=False)
+            if thumbnail_path and self.screen_capture.is_cached(thumbnail_path):
                 cached_thumbnails += 1
         
         # Format summary
@@ -653,9 +850,19 @@ Ready to see your 3D models instantly? Select a project folder to begin!"""
         query = self.search_var.get().strip()
         search_type = self.filter_var.get()
         
+        # Skip the refilter and list rebuild if the results can't have changed
+        query_sig = (query, search_type)
+        if query_sig == self._last_query_sig:
+            return
+        self._last_query_sig = query_sig
+        
         # Filter files
         if query:
-            self.filtered_files = [f for f in self.all_files if f.matches_search(query, search_type)]
+            query_lower = query.lower()
+            if search_type == "All":
+                self.filtered_files = self._search_trigram_index(query_lower)
+            else:
+                self.filtered_files = [f for f in self.all_files if f.matches_search(query_lower, search_type)]
         else:
             self.filtered_files = self.all_files.copy()
         
@@ -670,20 +877,19 @@ Ready to see your 3D models instantly? Select a project folder to begin!"""
     
     def update_file_list(self):
         """Update file list display"""
-        # Clear existing items
-        for item in self.file_tree.get_children():
-            self.file_tree.delete(item)
+        # Clear existing items in one call
+        self.file_tree.delete(*self.file_tree.get_children())
         
-        # Add filtered files
-        for file_info in self.filtered_files:
-            self.file_tree.insert('', 'end', values=(
+        # Add filtered files, using the list index as the item id
+        for i, file_info in enumerate(self.filtered_files):
+            self.file_tree.insert('', 'end', iid=str(i), values=(
                 file_info.name,
                 file_info.project_name,
                 file_info.job_name,
                 file_info.company_name,
-                Settings.get_file_type_description(str(file_info.path)),
+                file_info.type_description,
                 file_info.format_size(),
-                file_info.modified.strftime('%Y-%m-%d %H:%M')
+                file_info.modified_str
             ))
         
         # Update count
@@ -694,22 +900,16 @@ Ready to see your 3D models instantly? Select a project folder to begin!"""
         """Handle file selection"""
         selection = self.file_tree.selection()
         if selection:
-            item = selection[0]
-            values = self.file_tree.item(item, 'values')
-            filename = values[0]
+            # Item ids are indexes into filtered_files
+            file_info = self.filtered_files[int(selection[0])]
+            self.selected_file = file_info
+            self.show_file_preview(file_info)
+            self.load_thumbnail(file_info)
             
-            # Find file info
-            for file_info in self.filtered_files:
-                if file_info.name == filename:
-                    self.selected_file = file_info
-                    self.show_file_preview(file_info)
-                    self.load_thumbnail(file_info)
-                    
-                    # Enable buttons
-                    self.open_btn.config(state=tk.NORMAL)
-                    self.folder_btn.config(state=tk.NORMAL)
-                    self.thumbnail_btn.config(state=tk.NORMAL)
-                    break
+            # Enable buttons
+            self.open_btn.config(state=tk.NORMAL)
+            self.folder_btn.config(state=tk.NORMAL)
+            self.thumbnail_btn.config(state=tk.NORMAL)
         else:
             self.selected_file = None
             self.open_btn.config(state=tk.DISABLED)
@@ -718,6 +918,7 @@ Ready to see your 3D models instantly? Select a project folder to begin!"""
     
     def show_file_preview(self, file_info: FileInfo):
         """Show file preview"""
+        thumbnail_path = self.screen_capture.get_thumbnail_path(str(file_info.path), hash_content=False)
         preview_text = f"""📄 {file_info.name}
 
 📁 Location:
@@ -726,7 +927,7 @@ Ready to see your 3D models instantly? Select a project folder to begin!"""
 • Full Path: {file_info.path}
 
 📋 File Information:
-• Type: {Settings.get_file_type_description(str(file_info.path))}
+• Type: {file_info.type_description}
 • Size: {file_info.format_size()}
 • Modified: {file_info.modified.strftime('%Y-%m-%d %H:%M:%S')}
 • Created: {file_info.created.strftime('%Y-%m-%d %H:%M:%S')}
@@ -739,7 +940,7 @@ Ready to see your 3D models instantly? Select a project folder to begin!"""
 • Revision: {file_info.revision or 'Not detected'}
 
 🖼️ Thumbnail Information:
-• Thumbnail: {"Cached" if self.screen_capture.get_thumbnail_path(str(file_info.path)) and self.screen_capture.get_thumbnail_path(str(file_info.path)).exists() else "Not generated"}
+• Thumbnail: {"Cached" if thumbnail_path and self.screen_capture.is_cached(thumbnail_path) else "Not generated"}
 • Cache Directory: {self.screen_capture.cache_dir}
 
 💡 Actions:
@@ -762,9 +963,9 @@ Ready to see your 3D models instantly? Select a project folder to begin!"""
         self.current_thumbnail_image = None
         
         # Check if thumbnail already exists
-        thumbnail_path = self.screen_capture.get_thumbnail_path(str(file_info.path))
+        thumbnail_path = self.screen_capture.get_thumbnail_path(str(file_info.path), hash_content=False)
         
-        if thumbnail_path and thumbnail_path.exists():
+        if thumbnail_path and self.screen_capture.is_cached(thumbnail_path):
             # Load existing thumbnail
             self.display_thumbnail(str(thumbnail_path))
             self.thumbnail_status.config(text=f"Cached thumbnail: {file_info.name}")
@@ -772,7 +973,7 @@ Ready to see your 3D models instantly? Select a project folder to begin!"""
             # Generate new thumbnail
             self.generate_thumbnail(file_info)
     
-    def generate_thumbnail(self, file_info: FileInfo):
+    def generate_thumbnail(self, file_info: FileInfo, regenerate: bool = False):
         """Generate thumbnail for file"""
         if not file_info:
             return
@@ -787,17 +988,20 @@ Ready to see your 3D models instantly? Select a project folder to begin!"""
         
         self.thumbnail_status.config(text=f"Generating thumbnail for {file_info.name}...")
         
-        # Cancel any existing thumbnail generation
-        if self.thumbnail_worker and self.thumbnail_worker.is_alive():
-            return
-        
-        # Start thumbnail generation in background
-        self.thumbnail_worker = ThumbnailWorker(
-            str(file_info.path),
-            self.screen_capture,
-            self.on_thumbnail_generated
+        # Queue thumbnail generation on the background worker; it reports back
+        # through the Tk event loop since Tk must only be touched from this thread
+        requested_path = str(file_info.path)
+        self.thumbnail_worker.enqueue(
+            requested_path,
+            lambda path, error: self.root.after(0, self._deliver_thumbnail, requested_path, path, error),
+            regenerate
         )
-        self.thumbnail_worker.start()
+    
+    def _deliver_thumbnail(self, requested_path: str, thumbnail_path: str, error: str):
+        """Show a finished thumbnail unless another file has been selected since"""
+        if self.selected_file and str(self.selected_file.path) != requested_path:
+            return
+        self.on_thumbnail_generated(thumbnail_path, error)
     
     def on_thumbnail_generated(self, thumbnail_path: str, error: str):
         """Handle thumbnail generation completion"""
@@ -856,21 +1060,16 @@ Ready to see your 3D models instantly? Select a project folder to begin!"""
         if not self.selected_file:
             return
         
-        # Delete cached thumbnail
-        thumbnail_path = self.screen_capture.get_thumbnail_path(str(self.selected_file.path))
-        if thumbnail_path and thumbnail_path.exists():
-            thumbnail_path.unlink()
-        
-        # Generate new thumbnail
-        self.generate_thumbnail(self.selected_file)
+        # The worker discards the cached thumbnail, since finding it means
+        # hashing the file
+        self.generate_thumbnail(self.selected_file, regenerate=True)
     
     def clear_thumbnail_cache(self):
         """Clear all cached thumbnails"""
         try:
-            import shutil
-            if self.screen_capture.cache_dir.exists():
-                shutil.rmtree(self.screen_capture.cache_dir)
-                self.screen_capture.cache_dir.mkdir()
+            # Goes through the capture system so its in-memory list of
+            # cached thumbnails is cleared too
+            self.screen_capture.clear_cache()
             
             messagebox.showinfo("Cache Cleared", "All cached thumbnails have been cleared.")
             
@@ -942,13 +1141,13 @@ Ready to see your 3D models instantly? Select a project folder to begin!"""
         
         # Properties content
         file_info = self.selected_file
-        thumbnail_path = self.screen_capture.get_thumbnail_path(str(file_info.path))
+        thumbnail_path = self.screen_capture.get_thumbnail_path(str(file_info.path), hash_content=False)
         
         properties = f"""File Properties: {file_info.name}
 
 General:
 • Name: {file_info.name}
-• Type: {Settings.get_file_type_description(str(file_info.path))}
+• Type: {file_info.type_description}
 • Size: {file_info.format_size()} ({file_info.size:,} bytes)
 • Location: {file_info.parent}
 
@@ -964,7 +1163,7 @@ Project Information:
 • Revision: {file_info.revision or 'Not detected'}
 
 Thumbnail Information:
-• Thumbnail Status: {"Available" if thumbnail_path and thumbnail_path.exists() else "Not generated"}
+• Thumbnail Status: {"Available" if thumbnail_path and self.screen_capture.is_cached(thumbnail_path) else "Not generated"}
 • Thumbnail Path: {thumbnail_path or "Not generated"}
 • Cache Directory: {self.screen_capture.cache_dir}
 
@@ -1044,7 +1243,7 @@ Built for engineering productivity with ICAD integration!
     def on_closing(self):
         """Handle application closing"""
         # Clean up any running processes
-        if self.thumbnail_worker and self.thumbnail_worker.is_alive():
+        if self.thumbnail_worker.pending():
             print("Waiting for thumbnail generation to complete...")
         
         self.root.destroy()
@@ -1,2 +1,117 @@
 # Test Search Engine
-# TODO: Implement search tests
+import pytest
+
+from core.database import DatabaseManager
+from core.search_engine import SearchEngine
+
+FILES = [
+    ('A-1234_rev2.icd', 'North Tower', 'Phase 1', 'Acme Corp'),
+    ('A-1234-rev2.icd', 'Tower North', 'Phase 2', 'ACME Industries'),
+    ('B5678.icd', 'Mall MEP', 'Job 100%', 'Fujitsu'),
+    ('b5678 copy.icd', 'mall mep', 'Job 1000', 'Other Co'),
+    ('SK001_D.icd', 'Residential Complex', 'Block A', 'Acme Corp'),
+    ('plain.icd', '', '', ''),
+]
+
+
+@pytest.fixture
+def engine(tmp_path):
+    db = DatabaseManager(tmp_path / "test.db")
+    for filename, project, job, company in FILES:
+        db.add_file({
+            'file_path': str(tmp_path / filename),
+            'filename': filename,
+            'project_name': project,
+            'job_name': job,
+            'company_name': company,
+            'file_type': '.icd',
+        })
+    return SearchEngine(db)
+
+
+def paths(files):
+    return [f['file_path'] for f in files]
+
+
+@pytest.mark.parametrize('search_type', ['All', 'Filename', 'Project', 'Job', 'Company'])
+@pytest.mark.parametrize('query', [
+    'a', 'A-12', '1234', 'rev2', 'TOWER', 'ower', 'acme', 'b5678', '.icd',
+    'north tower', 'tower north', 'mall mep', 'ph', 'missing', 'acme corp',
+    'wer n', ' tower', 'copy.icd', 'job 1',
+])
+def test_index_matches_like_search(engine, query, search_type):
+    like = engine.db_manager.search_files(query, search_type)
+    assert paths(engine.quick_search(query, search_type)) == paths(like)
+
+
+def test_multi_word_query_must_be_contiguous(engine):
+    assert paths(engine.quick_search('north tower', 'Project')) == \
+        paths(engine.quick_search('North Tower', 'Project'))
+    projects = [f['project_name'] for f in engine.quick_search('north tower', 'Project')]
+    assert projects == ['North Tower']
+
+
+def test_multi_word_query_checks_each_field_separately(engine):
+    # 'Tower' is in the project and 'Phase' in the job, but no one field has both
+    assert engine.quick_search('tower phase') == []
+
+
+@pytest.mark.parametrize('query, expected', [
+    ('_rev', ['A-1234_rev2.icd']),
+    ('1234_', ['A-1234_rev2.icd']),
+    ('k001_d', ['SK001_D.icd']),
+    ('100%', ['B5678.icd']),
+])
+def test_like_wildcards_match_literally(engine, query, expected):
+    assert [f['filename'] for f in engine.quick_search(query)] == expected
+
+
+def test_like_wildcards_were_wildcards_in_sql(engine):
+    # The SQL search this replaced read '_' as any character
+    like = [f['filename'] for f in engine.db_manager.search_files('1234_', 'All')]
+    assert like == ['A-1234-rev2.icd', 'A-1234_rev2.icd']
+
+
+def test_index_follows_database_changes(engine, tmp_path):
+    assert engine.quick_search('newfile') == []
+    engine.db_manager.add_file({
+        'file_path': str(tmp_path / 'NewFile.icd'),
+        'filename': 'NewFile.icd',
+    })
+    assert [f['filename'] for f in engine.quick_search('newfile')] == ['NewFile.icd']
+
+
+@pytest.fixture
+def explorer_files(tmp_path):
+    from types import SimpleNamespace
+    from main import FileInfo, ICADFileExplorer
+    
+    names = ['aaa.icd', 'aaaa.icd', 'baaab.icd', 'A-1234_rev2.icd', 'Tower_North.icd', 'ab.icd']
+    files = []
+    for name in names:
+        path = tmp_path / name
+        path.touch()
+        files.append(FileInfo(path))
+    
+    explorer = SimpleNamespace(all_files=files)
+    explorer._trigram_index = ICADFileExplorer._build_trigram_index(explorer, files)
+    return explorer
+
+
+@pytest.mark.parametrize('query', [
+    '', 'a', 'ab', '.i', 'aaa', 'aaaa', 'aaaaa', 'aab', 'abab', 'tower', 'er_n',
+    '1234_rev', 'a-1', '.icd', 'missing', 'xyz',
+])
+def test_trigram_search_matches_linear_search(explorer_files, query):
+    from main import ICADFileExplorer
+    
+    expected = [f for f in explorer_files.all_files if f.matches_search(query, 'All')]
+    assert ICADFileExplorer._search_trigram_index(explorer_files, query) == expected
+
+
+def test_trigram_search_confirms_repeated_trigrams(explorer_files):
+    from main import ICADFileExplorer
+    
+    # 'aaaa' only has the trigram 'aaa', which 'aaa.icd' and 'baaab.icd' also contain
+    names = [f.name for f in ICADFileExplorer._search_trigram_index(explorer_files, 'aaaa')]
+    assert names == ['aaaa.icd']
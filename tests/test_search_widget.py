@@ -0,0 +1,67 @@
+# Test Search Widget
+import re
+
+import pytest
+
+from gui.search_widget import _lower_pattern
+
+
+def matches_like_ignorecase(pattern: str, text: str) -> bool:
+    """Search text the way search_with_regex does for case-insensitive queries"""
+    lowered = _lower_pattern(pattern)
+    if lowered is None:
+        return bool(re.search(pattern, text, re.IGNORECASE))
+    return bool(re.search(lowered, text.lower()))
+
+
+def test_plain_pattern_is_lowercased():
+    assert _lower_pattern('ABC-[A-Z]+') == 'abc-[a-z]+'
+
+
+@pytest.mark.parametrize('pattern', [r'\D', r'\W', r'\S', r'\B', r'\A', r'\Z'])
+def test_escapes_keep_their_case(pattern):
+    assert _lower_pattern(pattern) == pattern
+
+
+@pytest.mark.parametrize('pattern', [
+    '(?P<Name>A)(?P=Name)',
+    '(?i)ABC',
+    '(?:ABC)',
+    '(?=ABC)',
+    '(?<!X)ABC',
+])
+def test_extension_groups_fall_back_to_ignorecase(pattern):
+    assert _lower_pattern(pattern) is None
+    re.compile(pattern)
+
+
+@pytest.mark.parametrize('pattern, text, expected', [
+    ('abc', 'xxABCxx', True),
+    ('A-1234', 'a-1234.icd', True),
+    (r'\d{4}', 'A-1234', True),
+    (r'\D+\d', 'AB1', True),
+    ('(?P<Name>A)(?P=Name)', 'xAAx', True),
+    ('(?P<Name>A)(?P=Name)', 'xAx', False),
+    ('(?:PART)-\\d', 'part-1', True),
+])
+def test_matches_like_ignorecase(pattern, text, expected):
+    assert matches_like_ignorecase(pattern, text) is expected
+    assert bool(re.search(pattern, text, re.IGNORECASE)) is expected
+
+
+@pytest.mark.parametrize('pattern', [
+    r'\x41BC',
+    r'\u0041BC',
+    r'\U00000041BC',
+    r'\N{LATIN CAPITAL LETTER A}BC',
+    r'\101BC',
+    r'\0',
+])
+def test_character_code_escapes_fall_back_to_ignorecase(pattern):
+    assert _lower_pattern(pattern) is None
+    assert matches_like_ignorecase(pattern, 'abc') is (pattern != r'\0')
+
+
+@pytest.mark.parametrize('pattern', [r'(A)\1', r'(A)(B)\2\1', r'(A)\1(B)\2'])
+def test_group_references_are_kept(pattern):
+    assert _lower_pattern(pattern) == pattern.lower()
@@ -97,7 +97,9 @@ class FileUtils:
     def get_file_hash(file_path: str, algorithm: str = 'md5') -> Optional[str]:
         """Calculate file hash"""
         try:
-            if algorithm.lower() == 'md5':
+            if algorithm.lower() == 'blake2b':
+                hash_obj = hashlib.blake2b(digest_size=16)
+            elif algorithm.lower() == 'md5':
                 hash_obj = hashlib.md5()
             elif algorithm.lower() == 'sha1':
                 hash_obj = hashlib.sha1()
@@ -199,7 +201,7 @@ class FileUtils:
             if not FileUtils.is_valid_icad_file(file_path):
                 continue
             
-            file_hash = FileUtils.get_file_hash(file_path)
+            file_hash = FileUtils.get_file_hash(file_path, 'blake2b')
             if file_hash:
                 if file_hash in hash_map:
                     hash_map[file_hash].append(file_path)